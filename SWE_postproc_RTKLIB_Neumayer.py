@@ -170,7 +170,8 @@ GNSS_refr_radius_90 = f.calc_footprint(90)
 # import / read laser reference data starting from 01.11.2021
 laser = f.read_laser_observations(dest_path, laser_path, yy_LBLR, laser_pickle='nm_laser')
 # read all other reference sensors data
-manual, manual_NEW, ipol, buoy, poles, mob, synop = f.read_reference_data(dest_path, laser_path, mob_path, synop_path, yy_LBLR, url=buoy_url, read_manual=True, read_buoy=True, read_poles=True, read_laser=False, read_mob=True, read_synop=True, mob_pickle='nm_mob', synop_pickle='nm_synop')
+reference_data = f.read_reference_data(dest_path, laser_path, mob_path, synop_path, yy_LBLR, url=buoy_url, read_manual=True, read_buoy=True, read_poles=True, read_laser=False, read_mob=True, read_synop=True, mob_pickle='nm_mob', synop_pickle='nm_synop')
+manual, manual_NEW, ipol, buoy, poles, mob, synop = (reference_data[key] for key in ['manual', 'manual_NEW', 'ipol', 'buoy', 'poles', 'mob', 'synop'])
 # filter laser data and calculate swe with once constant density of 402 kg/m² and once with the interpolated mnaual density measurements (ipol)
 laser_filtered = f.filter_laser_observations(ipol, laser, threshold=1)
 # resample laser sensor data to daily and 15min intervals
@@ -331,10 +332,10 @@ GNSSRR_JBUR_laser_manual_R, GNSSRR_JBUR_laser_manual_R_p = f.dependency(manual_N
 swe_over_sh_datetime, swe_over_sh = f.create_new_df(gnssir_acc_daily.interpolate()/1000, 'GNSS-IR_sh', swe_gnss_daily_LBLR.interpolate(), 'swe_gnss_daily_LBLR', swe_gnss_daily_LBUR.interpolate(), 'swe_gnss_daily_LBUR', swe_gnss_daily_JBLR.interpolate(), 'swe_gnss_daily_JBLR', swe_gnss_daily_JBUR.interpolate(), 'swe_gnss_daily_JBUR')
 swe_over_sh.loc[0] = [0, 0, 0, 0]  # adding a row
 swe_over_sh = swe_over_sh.sort_index()  # sorting by index
-exp_fit_LBLR = f.exponential_regression('swe versus snow height - LBLR', np.array(swe_over_sh.index), np.array(swe_over_sh.swe_gnss_daily_LBLR.tolist()), y_0=0)
-exp_fit_LBUR = f.exponential_regression('swe versus snow height - LBUR', np.array(swe_over_sh.index), np.array(swe_over_sh.swe_gnss_daily_LBUR.tolist()), y_0=0)
-exp_fit_JBLR = f.exponential_regression('swe versus snow height - JBLR', np.array(swe_over_sh.index), np.array(swe_over_sh.swe_gnss_daily_JBLR.tolist()), y_0=0)
-exp_fit_JBUR = f.exponential_regression('swe versus snow height - JBUR', np.array(swe_over_sh.index), np.array(swe_over_sh.swe_gnss_daily_JBUR.tolist()), y_0=0)
+exp_fit_LBLR, exp_fit_LBUR, exp_fit_JBLR, exp_fit_JBUR = f.exponential_regression_batch(['swe versus snow height - LBLR', 'swe versus snow height - LBUR', 'swe versus snow height - JBLR', 'swe versus snow height - JBUR'],
+                                                                                          [np.array(swe_over_sh.index)] * 4,
+                                                                                          [np.array(swe_over_sh.swe_gnss_daily_LBLR.tolist()), np.array(swe_over_sh.swe_gnss_daily_LBUR.tolist()), np.array(swe_over_sh.swe_gnss_daily_JBLR.tolist()), np.array(swe_over_sh.swe_gnss_daily_JBUR.tolist())],
+                                                                                          y_0=0)
 # create out of the exponential fit function a vector that contains in 0.01 spacing all x-values
 exp_fit_LBLR = [np.linspace(0, 1.5, 151), f.func_exp(np.linspace(0, 1.5, 151), exp_fit_LBLR[2][0], exp_fit_LBLR[2][1], exp_fit_LBLR[2][2]), exp_fit_LBLR[2]]
 exp_fit_LBUR = [np.linspace(0, 1.5, 151), f.func_exp(np.linspace(0, 1.5, 151), exp_fit_LBUR[2][0], exp_fit_LBUR[2][1], exp_fit_LBUR[2][2]), exp_fit_LBUR[2]]
@@ -344,10 +345,10 @@ exp_fit_JBUR = [np.linspace(0, 1.5, 151), f.func_exp(np.linspace(0, 1.5, 151), e
 swe_over_sh_datetime_0103, swe_over_sh_0103 = f.create_new_df(gnssir_acc_daily[gnssir_acc_daily.index >= '2022-03-01'].interpolate()/1000, 'GNSS-IR_sh', swe_gnss_daily_LBLR.interpolate(), 'swe_gnss_daily_LBLR', swe_gnss_daily_LBUR.interpolate(), 'swe_gnss_daily_LBUR', swe_gnss_daily_JBLR.interpolate(), 'swe_gnss_daily_JBLR', swe_gnss_daily_JBUR.interpolate(), 'swe_gnss_daily_JBUR')
 swe_over_sh_0103.loc[0] = [0, 0, 0, 0]  # adding a row
 swe_over_sh_0103 = swe_over_sh_0103.sort_index()  # sorting by index
-exp_fit_LBLR_0103 = f.exponential_regression('swe versus snow (starting 1/3/22) - LBLR', np.array(swe_over_sh_0103.index), np.array(swe_over_sh_0103.swe_gnss_daily_LBLR.tolist()), y_0=0)
-exp_fit_LBUR_0103 = f.exponential_regression('swe versus snow height (starting 1/3/22) - LBUR', np.array(swe_over_sh_0103.index), np.array(swe_over_sh_0103.swe_gnss_daily_LBUR.tolist()), y_0=0)
-exp_fit_JBLR_0103 = f.exponential_regression('swe versus snow height (starting 1/3/22) - JBLR', np.array(swe_over_sh_0103.index), np.array(swe_over_sh_0103.swe_gnss_daily_JBLR.tolist()), y_0=0)
-exp_fit_JBUR_0103 = f.exponential_regression('swe versus snow height (starting 1/3/22) - JBUR', np.array(swe_over_sh_0103.index), np.array(swe_over_sh_0103.swe_gnss_daily_JBUR.tolist()), y_0=0)
+exp_fit_LBLR_0103, exp_fit_LBUR_0103, exp_fit_JBLR_0103, exp_fit_JBUR_0103 = f.exponential_regression_batch(['swe versus snow (starting 1/3/22) - LBLR', 'swe versus snow height (starting 1/3/22) - LBUR', 'swe versus snow height (starting 1/3/22) - JBLR', 'swe versus snow height (starting 1/3/22) - JBUR'],
+                                                                                                              [np.array(swe_over_sh_0103.index)] * 4,
+                                                                                                              [np.array(swe_over_sh_0103.swe_gnss_daily_LBLR.tolist()), np.array(swe_over_sh_0103.swe_gnss_daily_LBUR.tolist()), np.array(swe_over_sh_0103.swe_gnss_daily_JBLR.tolist()), np.array(swe_over_sh_0103.swe_gnss_daily_JBUR.tolist())],
+                                                                                                              y_0=0)
 # create out of the exponential fit function a vector that contains in 0.01 spacing all x-values
 exp_fit_LBLR_0103 = [np.linspace(0, 1.5, 151), f.func_exp(np.linspace(0, 1.5, 151), exp_fit_LBLR_0103[2][0], exp_fit_LBLR_0103[2][1], exp_fit_LBLR_0103[2][2]), exp_fit_LBLR_0103[2]]
 exp_fit_LBUR_0103 = [np.linspace(0, 1.5, 151), f.func_exp(np.linspace(0, 1.5, 151), exp_fit_LBUR_0103[2][0], exp_fit_LBUR_0103[2][1], exp_fit_LBUR_0103[2][2]), exp_fit_LBUR_0103[2]]
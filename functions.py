@@ -13,6 +13,7 @@
                     - gfzrnx (https://dataservices.gfz-potsdam.de/panmetaworks/showshort.php?id=escidoc:1577894)
                     - jps2rin (http://www.javadgnss.com.cn/products/software/jps2rin.html)
                     - wget
+                    - pyarrow (parquet storage of solutions)
                     - 7zip
                     - path to all programs added to the system environment variables
 """
@@ -20,10 +21,12 @@
 import subprocess
 import os
 import glob
+import fnmatch
 import datetime
 import shutil
 import lzma
 import tarfile
+import gzip
 import gnsscal
 import datetime as dt
 import pandas as pd
@@ -39,12 +42,39 @@ from termcolor import colored
 import requests
 import zipfile
 import io
+import tempfile
+import warnings
+import ftplib
+import threading
+from urllib.parse import urlparse
 from datetime import date
 import re
 import py7zr
 from itertools import chain
-import math
-
+from collections import defaultdict, namedtuple
+import json
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Q: compiled regular expression for digits in filenames (e.g. doy and year of 'nmsh329x.21o')
+DIGITS_RE = re.compile(r'\d+')
+# Q: compiled regular expressions to unpack filenames in one pass:
+#    Emlid original rinex files, e.g. 'ReachM2_sladina-raw_202112041058.21O'
+EMLID_NAME_RE = re.compile(r'_(?P<datetime>\d{12})\.(?P<yy>\d{2})')
+#    gfzrnx rinex 3 output files, e.g. 'NMER00XXX_R_20213291100_01D_30S_MO.rnx'
+RNX3_NAME_RE = re.compile(r'^.{4}(?P<name>.{5}_R_\d{2}(?P<yy>\d{2})(?P<doy>\d{3})[^.]*)\.')
+# Q: timestamp format of rtklib solution files (date and time columns), e.g. '2021/11/26 00:00:00.000'
+RTKLIB_TIME_FORMAT = '%Y/%m/%d %H:%M:%S.%f'
+# Q: grid of the number of solutions per day (and its 1/sqrt) for the manual std/sqrt(n) fit in solution_control
+SOLUTION_CONTROL_N = np.linspace(1, 96, 951)
+SOLUTION_CONTROL_INV_SQRT_N = 1.0 / np.sqrt(SOLUTION_CONTROL_N)
+# Q: compact dtypes of the GNSS-IR (gnssrefl) solution file columns, UTCtime and MJD stay float64 (timestamp precision)
+GNSSIR_DTYPES = {'year': np.int16, 'doy': np.int16, 'sat': np.int16, 'freq': np.int16, 'UTCtime': np.float64,
+                 'RH': np.float32, 'Azim': np.float32, 'Amp': np.float32, 'eminO': np.float32, 'emaxO': np.float32,
+                 'EdotF': np.float32, 'PkNoise': np.float32, 'DelT': np.float32}
+# Q: plot parameters of one data series (ds1...ds9) in plot_ds
+PlotSeries = namedtuple('PlotSeries', 'ds bar std bias err fit yaxis linestyle fit_linestyle transparency marker markersize color label std_label fit_label')
 
 
 """ Define general functions """
@@ -80,6 +110,74 @@ def get_mjd_int(syyyy, smm, sdd, eyyyy, emm, edd):
     return start_mjd, end_mjd
 
 
+@lru_cache(maxsize=1024)
+def yrdoy2date_mjd_gpswd(yy, doy):
+    """ convert two-digit year and day of year to date, modified julian date (mjd), gpsweek and day of week,
+        results are cached as the same days are converted repeatedly
+    :param yy: two-digit year, e.g. '22'
+    :param doy: day of year, e.g. '005' or 5
+    :return: date, mjd, gpsweek, dow
+    """
+    date = gnsscal.yrdoy2date(int('20' + str(yy)), int(doy))
+    mjd = jdcal.gcal2jd(date.year, date.month, date.day)[1]
+    (gpsweek, dow) = gnsscal.yrdoy2gpswd(int('20' + str(yy)), int(doy))
+    return date, mjd, gpsweek, dow
+
+
+def mjd2yrdoy(mjd):
+    """ convert modified julian date (mjd) to two-digit year and day of year
+    :param mjd: modified julian date
+    :return: yy, doy as strings, e.g. ('22', '005')
+    """
+    date = dt.date(*jdcal.jd2gcal(jdcal.MJD_0, mjd)[:3])
+    return date.strftime('%y'), date.strftime('%j')
+
+
+def yrdoy2mjd(yy, doy):
+    """ convert two-digit year and day of year to modified julian date (mjd)
+    :param yy: two-digit year, e.g. '22'
+    :param doy: day of year, e.g. '005'
+    :return: mjd
+    """
+    return yrdoy2date_mjd_gpswd(yy, doy)[1]
+
+
+def rolling_median_std(series, window):
+    """ calculate the rolling median and standard deviation of a time series with one rolling window object,
+        so that the window bounds are only computed once and each statistic is only computed once
+    :param series: pandas Series with DatetimeIndex
+    :param window: window length, e.g. '3D'
+    :return: rolling median, rolling standard deviation
+    """
+    rolling = series.rolling(window)
+    return rolling.median(), rolling.std()
+
+
+def write_parquet(df, path_pkl):
+    """ store a dataframe as zstd compressed parquet file next to the (legacy) pickle path
+    :param df: pandas dataframe with DatetimeIndex and string column names
+    :param path_pkl: path of the pickle file, its file extension is replaced by '.parquet'
+    :return: path of the parquet file
+    """
+    path_parquet = os.path.splitext(path_pkl)[0] + '.parquet'
+    df.to_parquet(path_parquet, engine='pyarrow', compression='zstd')
+    return path_parquet
+
+
+def read_parquet(path_pkl, columns=None):
+    """ read a dataframe from the parquet file, fall back to the legacy pickle file if no parquet file exists yet
+    :param path_pkl: path of the pickle file, its file extension is replaced by '.parquet'
+    :param columns: list of columns to read (only for parquet), None reads all columns
+    :return: pandas dataframe, None if neither file exists
+    """
+    path_parquet = os.path.splitext(path_pkl)[0] + '.parquet'
+    if os.path.exists(path_parquet):
+        return pd.read_parquet(path_parquet, engine='pyarrow', columns=columns, use_threads=True)
+    if os.path.exists(path_pkl):
+        return pd.read_pickle(path_pkl)
+    return None
+
+
 """ Define preprocessing functions """
 
 
@@ -91,7 +189,7 @@ def move_files2parentdir(dest_path, f):
     # get parent directory
     parent_dir = os.path.dirname(os.path.dirname(dest_path))
     # destination file in parent directory
-    dest_path_file = os.path.join(parent_dir, f.split("\\")[-1])
+    dest_path_file = os.path.join(parent_dir, os.path.basename(f))
     # move file if it does not already exist
     if not os.path.exists(dest_path_file):
         shutil.move(f, parent_dir)
@@ -157,24 +255,89 @@ def copy_file_no_overwrite(source_path, dest_path, file_name):
     pass
 
 
+def copy_file_fast(source_file, dest_file):
+    """ copy the content of a single file, using the in-kernel copy_file_range (reflink on CoW filesystems) where
+        available, otherwise shutil.copyfile (which uses sendfile/fast copy of the operating system)
+    :param source_file: path of source file
+    :param dest_file: path of destination file
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(source_file, 'rb') as fsrc, open(dest_file, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            return
+        except OSError:
+            # Q: e.g. not supported by the filesystem or across devices, use fallback
+            pass
+    shutil.copyfile(source_file, dest_file)
+
+
+def copy_if_changed(source_file, dest_file, cache):
+    """ copy a single file only if its size or modification time changed since the last backup
+    :param source_file: path of source file
+    :param dest_file: path of destination file
+    :param cache: dictionary {source file: [mtime_ns, size]} of the files copied during the last backup
+    :return: True if the file was copied, False if it was skipped
+    """
+    st = os.stat(source_file)
+    current = [st.st_mtime_ns, st.st_size]
+    if cache.get(source_file) == current and os.path.exists(dest_file):
+        return False
+    shutil.copy2(source_file, dest_file)
+    cache[source_file] = current
+    return True
+
+
+def copy_tree_cached(source_path, dest_path):
+    """ copy an entire directory tree, but skip all files which are unchanged since the last backup
+        (size and modification time are stored in '.backup_cache.json' in the destination directory)
+    :param source_path: source directory
+    :param dest_path: destination directory
+    :return: number of copied files
+    """
+    cache_file = os.path.join(dest_path, '.backup_cache.json')
+    try:
+        with open(cache_file) as fh:
+            cache = json.load(fh)
+    except (FileNotFoundError, ValueError):
+        cache = {}
+
+    nr_copied = 0
+    for root, dirs, files in os.walk(source_path):
+        dest_root = os.path.join(dest_path, os.path.relpath(root, source_path))
+        os.makedirs(dest_root, exist_ok=True)
+        for file in files:
+            nr_copied += copy_if_changed(os.path.join(root, file), os.path.join(dest_root, file), cache)
+
+    with open(cache_file, 'w') as fh:
+        json.dump(cache, fh)
+
+    return nr_copied
+
+
 def copy_solplotsdirs(source_path, dest_path):
     """ copy entire solution and plot directories
     :param source_path: local directory containing the solution and plot files
     :param dest_path: remote directory used for backup
     """
-    shutil.copytree(source_path + '20_solutions/', dest_path + '20_solutions/', dirs_exist_ok=True)
-    print('\ncopy directory: ' + source_path + '20_solutions/\nto: ' + dest_path + '20_solutions/')
-    shutil.copytree(source_path + '30_plots/', dest_path + '30_plots/', dirs_exist_ok=True)
-    print('copy directory: ' + source_path + '30_plots/\nto: ' + dest_path + '30_plots/')
+    nr_copied = copy_tree_cached(source_path + '20_solutions/', dest_path + '20_solutions/')
+    print('\ncopy directory: ' + source_path + '20_solutions/\nto: ' + dest_path + '20_solutions/ (%s changed files)' % nr_copied)
+    nr_copied = copy_tree_cached(source_path + '30_plots/', dest_path + '30_plots/')
+    print('copy directory: ' + source_path + '30_plots/\nto: ' + dest_path + '30_plots/ (%s changed files)' % nr_copied)
 
 
 def copy4backup(source_path, dest_path):
-    """ copy entire processing directory to server
+    """ copy entire processing directory to server, unchanged files are not copied again
     :param source_path: local processing directory containing
     :param dest_path: remote directory used for backup
     """
-    shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-    print('\ncopy directory: ' + source_path + '\nto: ' + dest_path)
+    nr_copied = copy_tree_cached(source_path, dest_path)
+    print('\ncopy directory: ' + source_path + '\nto: ' + dest_path + ' (%s changed files)' % nr_copied)
 
 
 # function for getting all files in lower folders of one directory, call like:
@@ -183,6 +346,35 @@ def copy4backup(source_path, dest_path):
 get_files = lambda path: (os.path.join(root, file) for root, dirs, files in os.walk(path) for file in files)
 
 
+def classify_files(dir_path):
+    """ sort all files of a directory into buckets by the last character of their (lower case) file extension,
+        e.g. '.21o' -> 'o', '.21d' -> 'd', '.zip' -> 'p', with a single directory scan
+    :param dir_path: directory containing the files
+    :return: buckets: dictionary {last character of file extension: [file paths]}
+    """
+    buckets = defaultdict(list)
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_file() and '.' in entry.name:
+                buckets[entry.name.lower()[-1]].append(entry.path)
+    return buckets
+
+
+def list_files(dir_path, prefix='', suffix=''):
+    """ list the names of all files in a directory which start with prefix, end with suffix and have a file extension,
+        like glob pattern 'prefix*.*suffix' (case-insensitive, as glob on Windows), with a single directory scan
+    :param dir_path: directory containing the files
+    :param prefix: start of file names, e.g. 'NMER'
+    :param suffix: end of file names, e.g. 'o' or '.rnx'
+    :return: sorted list of file names
+    """
+    prefix, suffix = prefix.lower(), suffix.lower()
+    with os.scandir(dir_path) as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.is_file() and '.' in entry.name[len(prefix):]
+                      and entry.name.lower().startswith(prefix) and entry.name.lower().endswith(suffix))
+
+
 def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', 'nmsh'], copy=[True, False],
                      parent=[True, False], hatanaka=[True, False], move=[True, False], delete_temp=[True, False]):
     """ copy rinex files of remote directory to a local temp directory if it does not already exist
@@ -215,7 +407,7 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
         if copy is True:
             for f in sorted(glob.glob(source_path + '*.zip'), reverse=False):
                 # construct the destination filename
-                dest_file = os.path.join(dest_path, f.split("\\")[-1])
+                dest_file = os.path.join(dest_path, os.path.basename(f))
                 # convert datetime to day of year (doy) from newest filename in source directory
                 doy_file = datetime.datetime.strptime(os.path.basename(f).split('_')[2], "%Y%m%d%H%M").strftime('%j')
                 yy_file = os.path.basename(f).split('_')[2][2:4]
@@ -223,7 +415,7 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
                 # Q: only copy files from server which are newer than the already existing doys of year=yy
                 if (yy_file == year_max and doy_file >= doy_max) or (yy_file > year_max):
                     # copy file if it does not already exist
-                    if not os.path.exists(dest_path + dest_file):
+                    if not os.path.exists(dest_file):
                         shutil.copy2(f, dest_path)
                         print("\nfile copied from %s to %s" % (f, dest_file))
                     else:
@@ -245,7 +437,8 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
 
         # Q: delete nav & zipped files
         if doy_file is not None:
-            for f in glob.glob(dest_path + '*.*[BPzip]'):
+            buckets = classify_files(dest_path)
+            for f in chain.from_iterable(buckets[c] for c in 'bpzi'):
                 os.remove(f)
             print("nav files deleted %s" % dest_path)
 
@@ -271,14 +464,14 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
         if copy is True:
             for f in glob.glob(source_path + '*.tar.xz'):
                 # create destination filename
-                dest_file = dest_path + f.split("\\")[-1]
+                dest_file = dest_path + os.path.basename(f)
                 doy_file = os.path.basename(f)[4:7]
                 yy_file = os.path.basename(f).split('.')[1][:2]
 
                 # Q: only copy files from server which are newer than the already existing doys of year=yy
                 if (yy_file == year_max and doy_file > doy_max) or (yy_file > year_max):
                     # copy file if it does not already exist
-                    if not os.path.exists(dest_path+dest_file):
+                    if not os.path.exists(dest_file):
                         shutil.copy2(f, dest_path)
                         print("\nfile copied from %s to %s" % (f, dest_file))
                     else:
@@ -323,10 +516,9 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
         if hatanaka is True:
             if doy_file is not None:
                 print(colored("\ndecompress hatanaka rinex files", 'blue'))
-                for hatanaka_file in glob.glob(dest_path + '*.*d'):
+                for hatanaka_file in classify_files(dest_path)['d']:
                     print('decompress hatanaka file: ', hatanaka_file)
-                    # subprocess.Popen('crx2rnx ' + hatanaka_file)
-                    subprocess.call('crx2rnx ' + hatanaka_file)
+                    subprocess.call(['crx2rnx', hatanaka_file])
                 print(colored("\nfinished decompressing hatanaka rinex files", 'blue'))
         else:
             pass
@@ -335,7 +527,8 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
         if move is True:
             if doy_file is not None:
                 print(colored("\nmove decompressed files to parent dir", 'blue'))
-                for f in glob.glob(dest_path + '*.*[ongl]'):
+                buckets = classify_files(dest_path)
+                for f in chain.from_iterable(buckets[c] for c in 'ongl'):
                     move_files2parentdir(dest_path, f)
                 print(colored("\nfinished moving decompressed files to parent dir", 'blue'))
 
@@ -350,8 +543,8 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
                 # Q: construct the destination filename
                 dest_file = ''.join(os.path.basename(f))
                 # Q: get day of year (doy) and year from newest filename in source directory
-                doy_file = ''.join(re.findall("\d+",os.path.basename(f).split('.')[0]))
-                yy_file = ''.join(re.findall("\d+",os.path.basename(f).split('.')[1]))
+                doy_file = ''.join(DIGITS_RE.findall(os.path.basename(f).split('.')[0]))
+                yy_file = ''.join(DIGITS_RE.findall(os.path.basename(f).split('.')[1]))
 
                 # Q: only copy files from server which are newer than the already existing doys of year=yy
                 if (yy_file == year_max and doy_file > doy_max) or (yy_file > year_max):
@@ -405,11 +598,10 @@ def copy_rinex_files(source_path, dest_path, receiver=['NMLB', 'NMLR', 'NMER', '
         else:
             print('renamed merged daily files are NOT moved to parent directory!')
 
-    # Q: get the newest year and doy after copying, and convert to modified julian date (mjd)
+    # Q: get the newest year and doy of the files actually present after copying, and convert to modified julian date (mjd)
     print('\nafter copyig the observation files from server and pre-processing them \nthe newest year and doy are in:')
     yy_file, doy_file = check_existing_files(dest_path, rover)
-    date_file = gnsscal.yrdoy2date(int('20' + yy_file), int(doy_file))
-    mjd_newest_file = jdcal.gcal2jd(date_file.year, date_file.month, date_file.day)[1]
+    mjd_newest_file = yrdoy2mjd(yy_file, doy_file)
 
     # Q: delete temp directory
     if delete_temp is True:
@@ -590,10 +782,8 @@ def process_merged_Leica(df_LR_merged, df_LB_merged, dest_path, mjd_start, mjd_e
     if df_LR_merged.empty is False or df_LB_merged.empty is False:
 
         # Q: calculate the start mjd of newly merged Leica files for Rover and Base
-        start_date_LR = gnsscal.yrdoy2date(int('20' + df_LR_merged['Year'].iloc[0]), int(df_LR_merged['DOY'].iloc[0]))
-        start_mjd_merged_LR = jdcal.gcal2jd(start_date_LR.year, start_date_LR.month, start_date_LR.day)[1]
-        start_date_LB = gnsscal.yrdoy2date(int('20' + df_LR_merged['Year'].iloc[0]), int(df_LR_merged['DOY'].iloc[0]))
-        start_mjd_merged_LB = jdcal.gcal2jd(start_date_LB.year, start_date_LB.month, start_date_LB.day)[1]
+        start_mjd_merged_LR = yrdoy2mjd(df_LR_merged['Year'].iloc[0], df_LR_merged['DOY'].iloc[0])
+        start_mjd_merged_LB = yrdoy2mjd(df_LR_merged['Year'].iloc[0], df_LR_merged['DOY'].iloc[0])
 
         # Q: only process newly merged files of which solutions already exist
         if mjd_end_LR_LB >= start_mjd_merged_LR or mjd_end_LR_LB >= start_mjd_merged_LB or mjd_end_ER_LB >= start_mjd_merged_LB:
@@ -612,9 +802,11 @@ def process_merged_Leica(df_LR_merged, df_LB_merged, dest_path, mjd_start, mjd_e
 
             # Q: delete temp directory
             temp_processing = dest_path + 'temp_reprocessing_merged/'
-            if os.path.exists(temp_processing):
+            try:
                 remove_folder(temp_processing)
                 print('\n temporary re-processing directory removed!')
+            except FileNotFoundError:
+                pass
 
         else:
             print('\nNO of the newly merged Leica files for Base and Rover need to be re-processed, as they are newer than the end date of existing solution files')
@@ -635,40 +827,38 @@ def gather_merged_files_4_processing(dest_path, df_LR_merged, df_LB_merged):
     temp_processing = dest_path + 'temp_reprocessing_merged/'
     create_folder(temp_processing)
 
-    # Q: construct needed filenames
-    df_LB_merged.insert(loc=0, column='LR_Filename', value='3393' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'o')
-    df_LB_merged.insert(loc=0, column='ER_Filename', value='NMER' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'o')
-    df_LR_merged.insert(loc=1, column='LB_Filename', value='3387' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'o')
-    df_LR_merged.insert(loc=2, column='LB_GPS_Filename', value='3387' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'n')
-    df_LR_merged.insert(loc=3, column='LB_Galileo_Filename', value='3387' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'l')
+    # Q: construct needed filenames from the year+doy of the merged Leica Base and Rover files ("doy0.yy")
+    doy_year_LB = [doy + '0.' + yy for doy, yy in zip(df_LB_merged['DOY'].values, df_LB_merged['Year'].values)]
+    df_LB_merged = df_LB_merged.assign(LR_Filename=['3393' + f + 'o' for f in doy_year_LB],
+                                       ER_Filename=['NMER' + f + 'o' for f in doy_year_LB])
+    doy_year_LR = [doy + '0.' + yy for doy, yy in zip(df_LR_merged['DOY'].values, df_LR_merged['Year'].values)]
+    df_LR_merged = df_LR_merged.assign(LB_Filename=['3387' + f + 'o' for f in doy_year_LR],
+                                       LB_GPS_Filename=['3387' + f + 'n' for f in doy_year_LR],
+                                       LB_Galileo_Filename=['3387' + f + 'l' for f in doy_year_LR])
 # TODO:
-#   df_LR_merged.insert(loc=4, column='LB_GLONASS_Filename', value='3387' + df_LB_merged['DOY'] + '0.' + df_LB_merged['Year'] + 'g')
+#                                      LB_GLONASS_Filename=['3387' + f + 'g' for f in doy_year_LR])
+
+    # Q: needed (Leica Base observation and navigation, Leica Rover and Emlid Rover) files based on year+doy of
+    #    merged Leica BASE Files and (Leica Base observation and navigation and Leica Rover) files based on
+    #    year+doy of merged Leica ROVER Files
+    needed_files = set(chain(df_LB_merged['Filename'], df_LB_merged['LR_Filename'], df_LB_merged['ER_Filename'], df_LB_merged['GPS_File'], df_LB_merged['Galileo_File'],       # TODO: , df_LB_merged['GLONASS_File'],
+                             df_LR_merged['Filename'], df_LR_merged['LB_Filename'], df_LR_merged['LB_GPS_Filename'], df_LR_merged['LB_Galileo_Filename']))                     # TODO: , df_LR_merged['LB_GLONASS_Filename']))
 
-    # Q: relocate (Leica Base observation and navigation, Leica Rover and Emlid Rover) files
-    #    to temporary processing directory based on year+doy of merged Leica BASE Files
+    # Q: relocate all needed files and the antex and rtklib-configuration files to temporary processing directory
+    #    with one pass over the processing directory
     print('\ncopy (Leica Base observation and navigation, Leica Rover and Emlid Rover observation) files '
-          'to temporary processing directory based on year and doy of newly merged Leica BASE Files.')
-    for f in chain(df_LB_merged['Filename'], df_LB_merged['LR_Filename'], df_LB_merged['ER_Filename'], df_LB_merged['GPS_File'], df_LB_merged['Galileo_File']):       # TODO: , df_LB_merged['GLONASS_File']):
-        if os.path.exists(dest_path + f):
-            shutil.copy2(dest_path + f, temp_processing)
-        else:
-            print('%s does not exist in processing directory and could not be moved to temporary processing folder!' % f)
-
-    # Q: relocate (Leica Base obervation and navigation and Leica Rover) files
-    #    to temporary processing directory based on year+doy of merged Leica ROVER Files
-    print('\ncopy (Leica Base observation and navigation and Leica Rover observation) files '
-          'to temporary processing directory based on year and doy of newly merged Leica ROVER Files.')
-    for f in chain(df_LR_merged['Filename'], df_LR_merged['LB_Filename'], df_LR_merged['LB_GPS_Filename'], df_LR_merged['LB_Galileo_Filename']):                      # TODO: , df_LR_merged['LB_GLONASS_Filename']):
-        if os.path.exists(dest_path+f):
-            shutil.copy2(dest_path + f, temp_processing)
-        else:
-            print('%s does not exist in processing directory or was already relocated to temporary processing directory' % f)
+          'to temporary processing directory based on year and doy of newly merged Leica Base and Rover Files.')
+    with os.scandir(dest_path) as entries:
+        file_sizes = {entry.name: entry.stat().st_size for entry in entries if entry.name in needed_files or entry.name.endswith(('.atx', '.conf'))}
+    copied_files = set(file_sizes)
+
+    # Q: copy files in parallel threads (overlapping the I/O latency, e.g. on network drives),
+    #    submit the largest files first so that no single large copy is left at the end of the batch
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda f: copy_file_fast(dest_path + f, temp_processing + f), sorted(file_sizes, key=file_sizes.get, reverse=True)))
 
-    # Q: copy antex and rtklib-configuration files to temporary processing folder
-    for f in glob.iglob(dest_path + '*.atx', recursive=True):
-        shutil.copy2(f, temp_processing)
-    for f in glob.iglob(dest_path + '*.conf', recursive=True):
-        shutil.copy2(f, temp_processing)
+    for f in sorted(needed_files - copied_files):
+        print('%s does not exist in processing directory and could not be copied to temporary processing folder!' % f)
 
 
 def replace_solution_files(dest_path, rover_name, base_name, resolution):
@@ -685,13 +875,16 @@ def replace_solution_files(dest_path, rover_name, base_name, resolution):
     solutions_path = '20_solutions/' + rover_name + '_' + base_name + '/' + resolution + '/'
     NEW_solutions = temp_processing + solutions_path + 'temp_' + rover_name + '/'
     OLD_solutions = dest_path + solutions_path
-    list_NEW_solutions = os.listdir(NEW_solutions)
+    try:
+        list_NEW_solutions = os.listdir(NEW_solutions)
+    except FileNotFoundError:
+        # Q: no newly re-processed solution files
+        return
 
     # Q: relocate newly re-processed .pos - solution files and replace the old in 20_solutions directory
-    if os.path.exists(NEW_solutions):
-        for f in list_NEW_solutions:
-            os.replace(NEW_solutions + f, OLD_solutions + f)
-        print('\n newly re-processed solution files of %s and %s replaced in 20_solution directory: \n%s'% (rover_name, base_name, list_NEW_solutions))
+    for f in list_NEW_solutions:
+        os.replace(os.path.join(NEW_solutions, f), os.path.join(OLD_solutions, f))
+    print('\n newly re-processed solution files of %s and %s replaced in 20_solution directory: \n%s'% (rover_name, base_name, list_NEW_solutions))
 
 
 def convert_datetime2doy_rinexfiles(dest_path, rover_prefix, rover_name):
@@ -702,70 +895,98 @@ def convert_datetime2doy_rinexfiles(dest_path, rover_prefix, rover_name):
 
     input filename: 'ReachM2_sladina-raw_202111251100.21O'  [rover_prefix + datetime + '.' + yy + 'O']
     output filename: 'NMER329[a..d].21o'                    [rover_prefix + doy + '0.' + yy + 'o']
+    :return: new_files: list of the new filenames
     """
     # Q: get doy from rinex filenames in temp dir with name structure: 'ReachM2_sladina-raw_202112041058.21O' [rover_prefix + datetime + '.' + yy + 'O']
     print(colored('\nrenaming all files', 'blue'))
-    for f in glob.iglob(dest_path + rover_prefix + '*.*O', recursive=True):
-        # get rinex filename and year
-        rover_file = os.path.basename(f)
-        yy = rover_file.split('.')[-1][:2]
+    # Q: count the files per doy and year to add the suffixes a, b, c, ... to files of the same day
+    nr_files_per_day = defaultdict(int)
+    new_files = []
+    for rover_file in list_files(dest_path, rover_prefix, 'o'):
+        f = dest_path + rover_file
+        match = EMLID_NAME_RE.search(rover_file)
+        yy = match['yy']
         # convert datetime to day of year (doy)
-        doy = datetime.datetime.strptime(rover_file.split('.')[0].split('_')[2], "%Y%m%d%H%M").strftime('%j')
-        # create new filename with doy
-        new_filename = dest_path + rover_name + doy + 'a.' + yy + 'o'
+        doy = datetime.datetime.strptime(match['datetime'], "%Y%m%d%H%M").strftime('%j')
+        # create new filename with doy and next free suffix of this day
+        suffix = chr(ord('a') + nr_files_per_day[(doy, yy)])
+        nr_files_per_day[(doy, yy)] += 1
+        new_filename = dest_path + rover_name + doy + suffix + '.' + yy + 'o'
         print('\nRover file: ' + rover_file, '\ndoy: ', doy, '\nNew filename: ', new_filename)
-
-        # check if new filename already exists and rename file
-        file_exists = os.path.exists(new_filename)  # True or False
-        if file_exists is True:
-            new_filename = dest_path + rover_name + doy + 'b.' + yy + 'o'
-            # check if new filename already exists and rename file
-            file_exists = os.path.exists(new_filename)  # True or False
-            if file_exists is True:
-                new_filename = dest_path + rover_name + doy + 'c.' + yy + 'o'
-                # check if new filename already exists and rename file
-                file_exists = os.path.exists(new_filename)  # True or False
-                if file_exists is True:
-                    new_filename = dest_path + rover_name + doy + 'd.' + yy + 'o'
-                else:
-                    os.rename(f, new_filename)
-                    print('\nNew filename already existing --> renamed to: ', new_filename)
-            else:
-                os.rename(f, new_filename)
-                print('\nNew filename already existing --> renamed to: ', new_filename)
-        else:
-            os.rename(f, new_filename)
+        # do not overwrite an already existing file with the same doy name (os.rename silently replaces it on POSIX)
+        if os.path.exists(new_filename):
+            print(colored("file in destination already exists, rename aborted: %s" % new_filename, 'yellow'))
+            continue
+        os.rename(f, new_filename)
+        new_files.append(os.path.basename(new_filename))
 
     print(colored('\nfinished renaming all files', 'blue'))
 
+    return new_files
 
-def split_rinex(dest_path, rover_name):
+
+def expand_wildcards(dir_path, pattern):
+    """ expand a file name pattern with wildcards ('*', '?') in a directory, as the commands are run without shell
+    :param dir_path: directory containing the files
+    :param pattern: file name pattern, e.g. 'NMER00XXX_R_2021329????_01D_30S_MO.21o'
+    :return: sorted list of matching file names
+    """
+    return sorted(os.path.basename(f) for f in glob.glob(os.path.join(glob.escape(dir_path), pattern)))
+
+
+def run_command(command, cwd, verbose=False):
+    """ run a command as subprocess, its output is only kept if needed
+    :param command: command given as list of program and arguments
+    :param cwd: working directory of the command
+    :param verbose: print the output of the command (True) or discard it and print only errors (False)
+    :return: finished subprocess
+    """
+    if verbose is True:
+        process = subprocess.run(command, cwd=cwd, capture_output=True)
+        print(process.stdout)
+        print(process.stderr)
+    else:
+        process = subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if process.returncode != 0:
+            print(colored('%s failed: %s' % (command[0], process.stderr), 'red'))
+    return process
+
+
+def run_commands(commands, cwd, verbose=False, max_workers=os.cpu_count()):
+    """ run independent commands (e.g. gfzrnx calls of different files or days) in parallel subprocesses
+    :param commands: list of commands, each given as list of program and arguments
+    :param cwd: working directory of the commands
+    :param verbose: print the output of the commands (True) or discard it and print only errors (False)
+    :param max_workers: maximum number of parallel subprocesses
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda command: run_command(command, cwd, verbose), commands))
+
+
+def split_rinex(dest_path, rover_name, rover_files=None, verbose=False):
     """ split day-overlapping rinex files at midnight --> get multiple subdaily files
     :param dest_path: local temporary directory for preprocessing the GNSS rinex files
     :param rover_name: name of rover receiver
+    :param rover_files: filenames to split (e.g. known from renaming them), if None the directory is scanned
+    :param verbose: print the gfzrnx output (True) or only errors (False)
 
     gfzrnx split input:  'NMER329[a..d].21o'    [rover + doy + '.' + yy + 'o']
     gfzrnx split output: '    00XXX_R_20213291100_01D_30S_MO.rnx'
     """
     print(colored('\nstart splitting day-overlapping rinex files', 'blue'))
-    for f in glob.iglob(dest_path + rover_name + '*.*o', recursive=True):
-        # get filename
-        rover_file = os.path.basename(f)
+    if rover_files is None:
+        rover_files = list_files(dest_path, rover_name, 'o')
+    commands = []
+    for rover_file in rover_files:
         print('\nstart splitting day-overlapping rinex file: %s' % rover_file)
 
         # split rinex file at midnight with command: 'gfzrnx -finp NMER345.21o -fout ::RX3:: -split 86400'
 
         #'gfzrnx -finp NMERdddf.yyo -fout ::RX3:: -split 86400'
+        commands.append(['gfzrnx', '-finp', rover_file, '-fout', '::RX3::', '-split', '86400'])
 
-        process1 = subprocess.Popen('cd ' + dest_path + ' && '
-                                                        'gfzrnx -finp ' + rover_file + ' -fout ::RX3:: -split 86400',
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-
-        stdout1, stderr1 = process1.communicate()
-        print(stdout1)
-        print(stderr1)
+    # Q: the files are independent of each other, split them in parallel
+    run_commands(commands, dest_path, verbose)
 
     print(colored('\nfinished splitting all day-overlapping rinex files at: %s' % dest_path, 'blue'))
 
@@ -777,24 +998,29 @@ def rename_splitted_rinexfiles(dest_path, rover_name):
 
     gfzrx split output: '    00XXX_R_20213291100_01D_30S_MO.rnx'
     gfzrx merge input:  'NMER00XXX_R_20213291100_01D_30S_MO.yyo'
+    :return: new_files: list of the new filenames
     """
     # Q: rename all .rnx files (gfzrnx split output --> gfzrnx merge input)
     print(colored('\nrenaming all splitted rinex files', 'blue'))
-    for f in glob.iglob(dest_path + '*.rnx', recursive=True):
-        rover_file = os.path.basename(f)
-        yy = rover_file.split('_')[2][2:4]
-        new_filename = dest_path + rover_name + rover_file.split('.')[0][4:] + '.' + yy + 'o'
+    new_files = []
+    for rover_file in list_files(dest_path, suffix='.rnx'):
+        match = RNX3_NAME_RE.match(rover_file)
+        new_filename = dest_path + rover_name + match['name'] + '.' + match['yy'] + 'o'
         print('\nRover file: ' + rover_file, '\nNew filename: ', new_filename)
-        os.rename(f, new_filename)
+        os.rename(dest_path + rover_file, new_filename)
+        new_files.append(os.path.basename(new_filename))
 
     print(colored('\nfinished renaming all splitted rinex files', 'blue'))
 
+    return new_files
+
 
-def merge_rinex_files(dest_path, gfzrnx_input):
+def merge_rinex_files(dest_path, gfzrnx_input, verbose=False):
     """
     split and merge rinex navigation files (.yy[g//l/n]) together per day --> get a daily rinex file
         :param dest_path: local temporary directory for preprocessing/merging the GNSS rinex files
         :param gfzrnx_input: the "common" filename(s) that shall be merged
+        :param verbose: print the gfzrnx output (True) or only errors (False)
         Example for GPS data:
         gfzrnx input:   "3387018*.23n", the "*" is needed so that all files that are merged can be found
         gfzrnx output:  "NAME00XXX_R_20YYDOY0000_01D_GN.rnx"
@@ -807,83 +1033,80 @@ def merge_rinex_files(dest_path, gfzrnx_input):
     if gfzrnx_input.endswith('g') or gfzrnx_input.endswith('l') or gfzrnx_input.endswith('n'):
         # Q: merge rinex files per day with command: 'gfzrnx -finp gfzrnx_input -fout ::RX3:: -kv -f -split 86400'
         print("\nstart merging navigation files %s in directory: %s" % (gfzrnx_input, dest_path))
-        process1 = subprocess.Popen('cd ' + dest_path + ' && '
-                                                        'gfzrnx -finp ' + gfzrnx_input + ' -fout ::RX3:: -kv -f -split 86400',
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
+        input_files = expand_wildcards(dest_path, gfzrnx_input)
+        if input_files:
+            run_command(['gfzrnx', '-finp', *input_files, '-fout', '::RX3::', '-kv', '-f', '-split', '86400'],
+                        dest_path, verbose)
+        else:
+            print(colored("no files matching %s, merging skipped" % gfzrnx_input, 'yellow'))
 
     # Q: merge OBSERVATION files
     if gfzrnx_input.endswith('o'):
         # Q: merge rinex files per day with command: 'gfzrnx -finp gfzrnx_input -fout ::RX3D:: -d 86400'
         print("\nstart merging observation files %s in directory: %s" % (gfzrnx_input, dest_path))
-        process1 = subprocess.Popen('cd ' + dest_path + ' && '
-                                                        'gfzrnx -finp ' + gfzrnx_input + ' -fout ::RX3D:: -d 86400',
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-
-    stdout1, stderr1 = process1.communicate()
-    print(stdout1)
-    print(stderr1)
+        input_files = expand_wildcards(dest_path, gfzrnx_input)
+        if input_files:
+            run_command(['gfzrnx', '-finp', *input_files, '-fout', '::RX3D::', '-d', '86400'],
+                        dest_path, verbose)
+        else:
+            print(colored("no files matching %s, merging skipped" % gfzrnx_input, 'yellow'))
 
 
-def merge_rinex(dest_path):
+def merge_rinex(dest_path, rover_files=None, verbose=False):
     """ merge rinex files together per day --> get daily rinex files of emlid receiver (NMER)
     :param dest_path: local temporary directory for preprocessing the GNSS rinex files
+    :param rover_files: filenames to merge (e.g. known from renaming them), if None the directory is scanned
+    :param verbose: print the gfzrnx output (True) or only errors (False)
 
     gfzrnx merge input:  'NMER00XXX_R_2021329????_01D_30S_MO.yyo'
     gfzrnx merge output: 'NMER00XXX_R_2021330????_01D_30S_MO.rnx'
     """
     print(colored('\nmerging all rinex files per day at: %s' % dest_path, 'blue'))
-    for f in glob.iglob(dest_path + 'NMER00XXX_R_20' + '*.*O', recursive=True):
-        # get filename
-        rover_file = os.path.basename(f)
-        yy = rover_file.split('_')[2][2:4]
-        # extract doy
-        doy = rover_file.split('.')[0][16:19]
+    if rover_files is None:
+        rover_files = list_files(dest_path, 'NMER00XXX_R_20', 'o')
+    # Q: group the files by day (several files belong to the same day)
+    files_per_day = defaultdict(list)
+    for rover_file in rover_files:
+        # extract year and doy
+        match = RNX3_NAME_RE.match(rover_file)
+        yy, doy = match['yy'], match['doy']
         print('\nRover file: ' + rover_file, '\ndoy: ', doy)
+        files_per_day[(yy, doy)].append(rover_file)
 
-        # merge rinex files per day with command: 'gfzrnx -finp NMER00XXX_R_2021330????_01D_30S_MO.21o' -fout ::RX3D:: -d 86400'
-        process1 = subprocess.Popen('cd ' + dest_path + ' && '
-                                                        'gfzrnx -finp NMER00XXX_R_20' + yy + doy + '????_01D_30S_MO.' + yy + 'o -fout ::RX3D:: -d 86400',
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
+    # merge rinex files per day with command: 'gfzrnx -finp NMER00XXX_R_2021330????_01D_30S_MO.21o' -fout ::RX3D:: -d 86400'
+    commands = [['gfzrnx', '-finp', *files, '-fout', '::RX3D::', '-d', '86400'] for files in files_per_day.values()]
 
-        stdout1, stderr1 = process1.communicate()
-        print(stdout1)
-        print(stderr1)
+    # Q: the days are independent of each other, merge them in parallel
+    run_commands(commands, dest_path, verbose)
 
     print(colored('\nfinished merging all rinex files per day at: %s' % dest_path, 'blue'))
 
 
-def merge_rinex_JAVAD(dest_path, file_prefix):
+def merge_rinex_JAVAD(dest_path, file_prefix, verbose=False):
     """ merge rinex files together per day --> get daily rinex files
     :param dest_path: local temporary directory for preprocessing the GNSS rinex files
     :param file_prefix: Gives the first 4 characters of the filename structure: "receiver_prefix + doy + 0 . yyo" e.g. 'nmsh'
+    :param verbose: print the gfzrnx output (True) or only errors (False)
     gfzrnx merge input:  'nmshDOYa.yyo' (with endings from a to x) 'nmshDOYx.yyo'
     gfzrnx merge output: 'NMSH00XXX_R_2021330????_01D_30S_MO.rnx'
     """
     print(colored('\nmerging all rinex files per day at: %s' % dest_path, 'blue'))
-    for f in glob.iglob(dest_path + file_prefix + '*x.*o', recursive=True):
-        # get filename
-        rover_file = os.path.basename(f)
+    commands = []
+    for rover_file in [f for f in list_files(dest_path, file_prefix, 'o') if f.split('.')[0].lower().endswith('x')]:
         # extract doy and year
-        doy = ''.join(re.findall("\d+", rover_file.split('.')[0]))
-        yy = ''.join(re.findall("\d+", rover_file.split('.')[1]))
+        doy = ''.join(DIGITS_RE.findall(rover_file.split('.')[0]))
+        yy = ''.join(DIGITS_RE.findall(rover_file.split('.')[1]))
         print('\nRover file: ' + rover_file, '\ndoy: ', doy)
 
         # merge rinex files per day with command: 'gfzrnx -finp nmsh????.yyo' -fout ::RX3D:: -d 86400'
-        process1 = subprocess.Popen('cd ' + dest_path + ' && '
-                                                        'gfzrnx -finp ' + file_prefix + doy + '?.' + yy + 'o -fout ::RX3D:: -d 86400',
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
+        input_files = expand_wildcards(dest_path, file_prefix + doy + '?.' + yy + 'o')
+        if input_files:
+            commands.append(['gfzrnx', '-finp', *input_files, '-fout', '::RX3D::', '-d', '86400'])
+        else:
+            print(colored("no files matching %s, merging skipped" % (file_prefix + doy + '?.' + yy + 'o'), 'yellow'))
 
-        stdout1, stderr1 = process1.communicate()
-        print(stdout1)
-        print(stderr1)
+    # Q: the days are independent of each other, merge them in parallel
+    run_commands(commands, dest_path, verbose)
 
     print(colored('\nfinished merging all rinex files per day at: %s' % dest_path, 'blue'))
 
@@ -900,28 +1123,13 @@ def jps2rin(dir_path, filename, rnx_version, rnx_naming=False, agency='-Unknown-
     :optional param Rcv_Type: Receiver Type (string may not contain blanks!)
     :optional param Ant_Type: Antenna Type (string may not contain blanks!)
     """
-    if rnx_naming is False:
-        jps2rin_process = subprocess.Popen('cd ' + dir_path + ' && '
-                                                               'jps2rin -v="' + rnx_version + '" --AG="' + agency + '" --RT="' + rcv_type+ '" --AT="' + ant_type + '" ' + filename,
-                                           shell=True,
-                                           stdout=subprocess.PIPE,
-                                           stderr=subprocess.PIPE)
-
-        jps2rin_stdout, jps2rin_stderr = jps2rin_process.communicate()
-        print("jps2rin output: %s" % jps2rin_stdout)
-        print("jps2rin errormessage: %s" % jps2rin_stderr)
-
-    else:
-        jps2rin_process = subprocess.Popen('cd ' + dir_path + ' && '
-                                                               'jps2rin -v="' + rnx_version + '" --rn --AG="' + agency + '" --RT="' + rcv_type+ '" --AT="' + ant_type + '" ' + filename,
-                                           shell=True,
-                                           stdout=subprocess.PIPE,
-                                           stderr=subprocess.PIPE)
-
-        jps2rin_stdout, jps2rin_stderr = jps2rin_process.communicate()
-        print("jps2rin output: %s" % jps2rin_stdout)
-        print("jps2rin errormessage: %s" % jps2rin_stderr)
+    # Q: with or without the Rinex naming convention for the output files
+    naming = [] if rnx_naming is False else ['--rn']
+    jps2rin_process = subprocess.run(['jps2rin', '-v=' + rnx_version, *naming, '--AG=' + agency, '--RT=' + rcv_type, '--AT=' + ant_type, filename],
+                                     cwd=dir_path, capture_output=True)
 
+    print("jps2rin output: %s" % jps2rin_process.stdout)
+    print("jps2rin errormessage: %s" % jps2rin_process.stderr)
 
 
 def rename_merged_rinexfiles(dest_path, rover_name):
@@ -931,12 +1139,11 @@ def rename_merged_rinexfiles(dest_path, rover_name):
     gfzrnx merge output: 'NMER00XXX_R_2021330????_01D_30S_MO.rnx'
     rtklib input: 'NMERdoy0.yyo'  [rover_prefix + doy + '0.' + yy + 'o']
     """
-    for f in glob.iglob(dest_path + '*.rnx', recursive=True):
-        rover_file = os.path.basename(f)
-        yy = rover_file.split('_')[2][2:4]
-        new_filename = dest_path + rover_name + rover_file.split('.')[0][16:19] + '0.' + yy + 'o'
+    for rover_file in list_files(dest_path, suffix='.rnx'):
+        match = RNX3_NAME_RE.match(rover_file)
+        new_filename = dest_path + rover_name + match['doy'] + '0.' + match['yy'] + 'o'
         print('\nRover file: ' + rover_file, '\nNew filename: ', new_filename)
-        os.rename(f, new_filename)
+        os.rename(dest_path + rover_file, new_filename)
 
     print(colored('\nfinished renaming all merged rinex files', 'blue'))
 
@@ -952,16 +1159,17 @@ def dayoverlapping2daily_rinexfiles(dest_path, rover_prefix, receiver):
     create_folder(dest_path)
 
     # convert Emlid files [rover_prefix + datetime + '.' + yy + 'O'] to format for 'gfzrnx' rinex conversion [rover_prefix + doy + '0.' + yy + 'o']
-    convert_datetime2doy_rinexfiles(dest_path, rover_prefix, receiver)
+    # (the renaming steps return the new filenames, so that the next step does not need to scan the directory again)
+    renamed_files = convert_datetime2doy_rinexfiles(dest_path, rover_prefix, receiver)
 
     # split rinex files at midnight for day-overlapping files --> get subdaily rinex files
-    split_rinex(dest_path, receiver)
+    split_rinex(dest_path, receiver, renamed_files)
 
     # rename splitted (subdaily) rinex files to match input for 'gfzrnx -merge'
-    rename_splitted_rinexfiles(dest_path, receiver)
+    splitted_files = rename_splitted_rinexfiles(dest_path, receiver)
 
     # merge rinex files together per day --> get daily rinex files
-    merge_rinex(dest_path)
+    merge_rinex(dest_path, splitted_files)
 
     # rename merged (daily) rinex files to match rtklib input format [rover_prefix + doy + '0.' + yy + 'o'] & move to parent directory
     rename_merged_rinexfiles(dest_path, receiver)
@@ -989,38 +1197,30 @@ def get_sol_yeardoy(dest_path, resolution, receiver=['NMLR', 'NMER'], base=['JB'
     :param base: name of base receiver (for directory path)
     :return: start_yy, start_mjd
     """
-    # check if a solution directory exists already, if yes
-    # check if any solution file (.pos) exists in solution directory for the given receiver
-    # if true: get the newest solution file year and doy
-    # if false: take default values (a solution directory is created in function: "automate_rtklib_pp")
-    if os.path.isdir(dest_path + '20_solutions/' + receiver + '_' + base + '/'):
-        if any(i.endswith('.pos') for i in os.listdir(dest_path + '20_solutions/' + receiver + '_' + base + '/' + resolution + '/')):
-            # get the newest solution file year and doy
-            print(colored('\nget start year and mjd of existing solution files of rover: %s and base: %s for further processing' % (receiver, base), 'blue'))
-            name_max = os.path.basename(
-                sorted(glob.iglob(dest_path + '20_solutions/' + receiver + '_' + base + '/' + resolution + '/*.pos', recursive=True), reverse=True)[
-                    0]).split('.')[0]
-            start_yy = name_max[2:4]
-            start_doy = int(name_max[-3:]) + 1
-            start_date = gnsscal.yrdoy2date(int('20' + start_yy), start_doy)
-            start_mjd = jdcal.gcal2jd(start_date.year, start_date.month, start_date.day)[1]
-            print(colored('start year %s, doy %s, mjd %s, date %s' % (start_yy, start_doy, start_mjd, start_date), 'blue'))
-        else:
-            print(colored("\nThere are no solution files yet of rover: %s and base: %s. "
-                          "Start year and mjd are set to default values for processing:" % (receiver, base), 'blue'))
-            start_yy = '21'
-            start_doy = 1
-            start_date = gnsscal.yrdoy2date(int('20' + start_yy), start_doy)
-            start_mjd = jdcal.gcal2jd(start_date.year, start_date.month, start_date.day)[1]
-            print(colored('start year %s, doy %s, mjd %s, date %s' % (start_yy, start_doy, start_mjd, start_date), 'blue'))
+    # get the newest solution file (.pos) in solution directory for the given receiver with a single directory scan
+    # (a missing solution directory is handled like a directory without solution files)
+    # if a solution file exists: get the newest solution file year and doy
+    # if not: take default values (a solution directory is created in function: "automate_rtklib_pp")
+    sol_dir = f'{dest_path}20_solutions/{receiver}_{base}/{resolution}/'
+    try:
+        with os.scandir(sol_dir) as entries:
+            name_max = max((entry.name for entry in entries if entry.name.endswith('.pos')), default=None)
+    except FileNotFoundError:
+        name_max = None
+
+    if name_max is not None:
+        # get the newest solution file year and doy
+        print(colored('\nget start year and mjd of existing solution files of rover: %s and base: %s for further processing' % (receiver, base), 'blue'))
+        name_max = name_max.split('.')[0]
+        start_yy = name_max[2:4]
+        start_doy = int(name_max[-3:]) + 1
     else:
-        print(colored("\nThere are no solution files yet: of rover: %s and base: %s. "
+        print(colored("\nThere are no solution files yet of rover: %s and base: %s. "
                       "Start year and mjd are set to default values for processing:" % (receiver, base), 'blue'))
         start_yy = '21'
         start_doy = 1
-        start_date = gnsscal.yrdoy2date(int('20' + start_yy), start_doy)
-        start_mjd = jdcal.gcal2jd(start_date.year, start_date.month, start_date.day)[1]
-        print(colored('start year %s, doy %s, mjd %s, date %s' % (start_yy, start_doy, start_mjd, start_date), 'blue'))
+    start_date, start_mjd = yrdoy2date_mjd_gpswd(start_yy, start_doy)[:2]
+    print(colored('start year %s, doy %s, mjd %s, date %s' % (start_yy, start_doy, start_mjd, start_date), 'blue'))
 
     return start_yy, start_mjd
 
@@ -1055,48 +1255,61 @@ def automate_rtklib_pp(dest_path, rover_prefix, mjd_start, mjd_end, ti_int, base
     """
     # Q: run rtklib for all rover files in directory
     print(colored('\n\nstart processing files with RTKLIB from rover: %s and base: %s' % (rover_name, base_name), 'blue'))
-    for file in glob.iglob(dest_path + rover_prefix + '*.*O', recursive=True):
-        # Q: get doy from rover filenames
-        rover_file = os.path.basename(file)
-        if rover_name == 'NMER_original':
-            # get date, year, modified julian date (mjd), doy, converted from datetime in Emlid original filename format (output from receiver, non-daily files)
-            date = dt.datetime.strptime(rover_file.split('.')[0].split('_')[2], "%Y%m%d%H%M")
-            year = str(date.year)[-2:]
-            mjd = jdcal.gcal2jd(date.year, date.month, date.day)[1]
-            doy = date.strftime('%j')
-        if rover_name == 'NMER' or rover_name == 'NMLR':
-            # get year, doy, date, modified julian date (mjd) directly from filename from Emlid pre-processed or Leica file name format (daily files)
-            year = rover_file.split('.')[1][:2]
-            doy = rover_file.split('.')[0][4:7]
-            date = gnsscal.yrdoy2date(int('20' + year), int(doy))
-            mjd = jdcal.gcal2jd(date.year, date.month, date.day)[1]
-
-        # Q: only process files inbetween the selected mjd range
-        if mjd_start <= mjd <= mjd_end:
-            print('\nProcessing rover file: ' + rover_file, '; year: ', year, '; doy: ', doy)
-
-            # convert doy to gpsweek and day of week (needed for precise orbit file names)
-            (gpsweek, dow) = gnsscal.yrdoy2gpswd(int('20' + year), int(doy))
-
-            # define input and output filenames (for some reason it's not working when input files are stored in subfolders!)
-            base_file = base_prefix + doy + '*.' + year + 'O'
-            broadcast_orbit_gps = brdc_nav_prefix + doy + '0.' + year + 'n'
-            broadcast_orbit_glonass = brdc_nav_prefix + doy + '0.' + year + 'g'
-            broadcast_orbit_galileo = brdc_nav_prefix + doy + '0.' + year + 'l'
-            precise_orbit = precise_nav_prefix + str(gpsweek) + str(dow) + '.EPH_M'
-
-            # create a solution directory if not existing
-            sol_dir = '20_solutions/' + rover_name + '_' + base_name + '/' + resolution + '/temp_' + rover_name + '/'
-            os.makedirs(dest_path + sol_dir, exist_ok=True)
-            output_file = sol_dir + '20' + year + '_' + rover_name + doy + ending + '.pos'
-
-            # Q: change directory to data directory & run RTKLib post processing command
-            run_rtklib_pp(dest_path, options, ti_int, output_file, rover_file, base_file,
-                          broadcast_orbit_gps, broadcast_orbit_glonass, broadcast_orbit_galileo, precise_orbit)
+    # Q: selected mjd range as (year, doy), to compare it directly with the year and doy in the filenames
+    yrdoy_start, yrdoy_end = mjd2yrdoy(mjd_start), mjd2yrdoy(mjd_end)
+    # Q: get year and doy of all rover files first and keep only the files inbetween the selected mjd range
+    entries = [(rover_file, *parse_rover_filename(rover_file, rover_name)) for rover_file in list_files(dest_path, rover_prefix, 'o')]
+    entries = [entry for entry in entries if yrdoy_start <= entry[1:] <= yrdoy_end]
+
+    # create a solution directory if not existing
+    sol_dir = '20_solutions/' + rover_name + '_' + base_name + '/' + resolution + '/temp_' + rover_name + '/'
+    os.makedirs(dest_path + sol_dir, exist_ok=True)
+    output_prefix = sol_dir + '20'
+
+    tasks = []
+    for rover_file, year, doy in entries:
+        print('\nProcessing rover file: ' + rover_file, '; year: ', year, '; doy: ', doy)
+
+        # convert year and doy to date, mjd, gpsweek and day of week (needed for precise orbit file names)
+        date, mjd, gpsweek, dow = yrdoy2date_mjd_gpswd(year, doy)
+
+        # define input and output filenames (for some reason it's not working when input files are stored in subfolders!)
+        base_file = base_prefix + doy + '*.' + year + 'O'
+        broadcast_orbit = f'{brdc_nav_prefix}{doy}0.{year}'
+        broadcast_orbit_gps = broadcast_orbit + 'n'
+        broadcast_orbit_glonass = broadcast_orbit + 'g'
+        broadcast_orbit_galileo = broadcast_orbit + 'l'
+        precise_orbit = f'{precise_nav_prefix}{gpsweek}{dow}.EPH_M'
+        output_file = f'{output_prefix}{year}_{rover_name}{doy}{ending}.pos'
+
+        tasks.append((dest_path, options, ti_int, output_file, rover_file, base_file,
+                      broadcast_orbit_gps, broadcast_orbit_glonass, broadcast_orbit_galileo, precise_orbit))
+
+    # Q: change directory to data directory & run RTKLib post processing command,
+    #    the days are independent of each other, process them in parallel (rnx2rtkp runs as subprocess)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(lambda task: run_rtklib_pp(*task), tasks))
 
     print(colored('\n\nfinished processing all files with RTKLIB from rover: %s and base: %s' % (rover_name, base_name), 'blue'))
 
 
+def parse_rover_filename(rover_file, rover_name):
+    """ get year and doy from rover filenames with name structure:
+            Leica Rover: '33933650.21o' [rover + doy + '0.' + yy + 'o']
+            Emlid Rover (pre-processed): 'NMER3650.21o' [rover + doy + '0.' + yy + 'o']
+            Emlid Rover (original): 'ReachM2_sladina-raw_202112041058.21O' [rover + datetime + '.' + yy + 'O']
+    :param rover_file: rover rinex filename
+    :param rover_name: name of rover ['NMER_original', 'NMER', 'NMLR']
+    :return: year, doy (as strings, e.g. '21', '365')
+    """
+    if rover_name == 'NMER_original':
+        # convert datetime in Emlid original filename format (output from receiver, non-daily files)
+        date_time = dt.datetime.strptime(EMLID_NAME_RE.search(rover_file)['datetime'], "%Y%m%d%H%M")
+        return str(date_time.year)[-2:], date_time.strftime('%j')
+    # get year and doy directly from filename from Emlid pre-processed or Leica file name format (daily files)
+    return rover_file.split('.')[1][:2], rover_file.split('.')[0][4:7]
+
+
 def run_rtklib_pp(dest_path, options, ti_int, output_file, rover_file, base_file, brdc_orbit_gps, brdc_orbit_glonass,
                   brdc_orbit_galileo, precise_orbit):
     """ run RTKLib post processing command (rnx2rtkp) as a subprocess (instead of manual RTKPost GUI)
@@ -1112,19 +1325,26 @@ def run_rtklib_pp(dest_path, options, ti_int, output_file, rover_file, base_file
         :param brdc_orbit_galileo: GNSS broadcast (predicted) orbit for GALILEO satellites
         :param precise_orbit: GNSS precise (post processed) orbit for multi-GNSS (GPS, GLONASS, GALILEO, BEIDOU)
     """
-    # change directory & run RTKLIB post processing command 'rnx2rtkp'
-    process = subprocess.Popen('cd ' + dest_path + ' && rnx2rtkp '
-                                                   '-k ' + options + '.conf '
-                                                                     '-ti ' + ti_int + ' '
-                                                                                       '-o ' + output_file + ' '
-                               + rover_file + ' ' + base_file + ' ' + brdc_orbit_gps + ' ' + brdc_orbit_glonass + ' ' + brdc_orbit_galileo + ' ' + precise_orbit,
-                               shell=True,
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE)
+    # run RTKLIB post processing command 'rnx2rtkp' in the data directory, discard processing output and print errors
+    # (wildcards in the input file names, e.g. in base_file, are expanded by rnx2rtkp itself)
+    run_command(['rnx2rtkp', '-k', options + '.conf', '-ti', ti_int, '-o', output_file, rover_file, base_file,
+                 brdc_orbit_gps, brdc_orbit_glonass, brdc_orbit_galileo, precise_orbit], cwd=dest_path)
+
+
+def read_rtklib_solution_file(file, header_length):
+    """ read a single rtklib ENU solution file (.pos) with the C parser (whitespace separated columns)
+    :param file: path of solution file
+    :param header_length: length of header in solution files (dependent on processing parameters)
+    :return: enu (pandas dataframe with datetimeindex and columns ['U', 'amb_state', 'nr_sat', 'std_u'])
+    """
+    enu = pd.read_csv(file, header=header_length, sep=r'\s+', engine='c', na_values=["NaN"],
+                      usecols=[0, 1, 4, 5, 6, 9], names=['date', 'time', 'U', 'amb_state', 'nr_sat', 'std_u'],
+                      dtype={'date': str, 'time': str, 'U': np.float64, 'std_u': np.float64})
 
-    stdout, stderr = process.communicate()
-    # print(stdout) # print processing output
-    print(stderr)  # print processing errors
+    # Q: combine date and time strings and parse them vectorized with a fixed format to the datetimeindex
+    enu.index = pd.DatetimeIndex(pd.to_datetime(enu['date'] + ' ' + enu['time'], format=RTKLIB_TIME_FORMAT, cache=True),
+                                 name='date_time')
+    return enu.drop(columns=['date', 'time'])
 
 
 def get_rtklib_solutions(dest_path, rover_name, resolution, ending, header_length, base_name=['LB', 'JB']):
@@ -1138,46 +1358,57 @@ def get_rtklib_solutions(dest_path, rover_name, resolution, ending, header_lengt
     """
     # Q: read all existing ENU solution data from .pkl if already exists, else create empty dataframe
     path_to_oldpickle = dest_path + '20_solutions/' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl'
-    if os.path.exists(path_to_oldpickle):
-        print(colored('\nReading already existing ENU solutions from pickle: %s' % path_to_oldpickle, 'yellow'))
-        df_enu_old = pd.read_pickle(path_to_oldpickle)
+    df_enu_old = read_parquet(path_to_oldpickle, columns=['U', 'amb_state', 'nr_sat', 'std_u'])
+    if df_enu_old is not None:
+        print(colored('\nReading already existing ENU solutions from parquet/pickle: %s' % path_to_oldpickle, 'yellow'))
     else:
         print(colored('\nNo existing ENU solution pickle: %s' % path_to_oldpickle, 'yellow'))
         df_enu_old = pd.DataFrame()
 
     # Q: read all newly available .ENU files in solution directory, parse date and time columns to datetimeindex and add them to the dataframe
-    df_enu_new = pd.DataFrame(columns=['U', 'amb_state', 'nr_sat', 'std_u', 'date', 'time'])
     path = dest_path + '20_solutions/' + rover_name + '_' + base_name + '/' + resolution + '/temp_' + rover_name
     print(colored('\nReading all newly available ENU solution files from receiver: %s' % rover_name, 'blue'))
-    for file in glob.iglob(path + '/*' + ending + '.pos', recursive=True):
-        print('reading ENU solution file: %s' % file)
-        enu = pd.read_csv(file, header=header_length, delimiter=' ', skipinitialspace=True, index_col=['date_time'],
-                          na_values=["NaN"],
-                          usecols=[0, 1, 4, 5, 6, 9], names=['date', 'time', 'U', 'amb_state', 'nr_sat', 'std_u'],
-                          parse_dates=[['date', 'time']])
-
-        # add new enu data to df enu
-        df_enu_new = pd.concat([df_enu_new, enu], axis=0)
-
-        # move file from temp directory to solutions directory after reading
-        shutil.move(file, path + '/../' + os.path.basename(file))
-
-    # remove date and time columns
-    df_enu_new = df_enu_new.drop(columns=['date', 'time'])
+    sol_dir = os.path.dirname(path)
+    files = [os.path.join(path, f) for f in list_files(path, suffix=ending + '.pos')] if os.path.exists(path) else []
+    # Q: parse files in parallel (pandas C parser releases the GIL), keep file order
+    enu_list = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        parsed = executor.map(read_rtklib_solution_file, files, [header_length] * len(files))
+        for file, enu in zip(files, parsed):
+            print('reading ENU solution file: %s' % file)
+
+            # collect new enu data, concatenated once after the loop
+            enu_list.append(enu)
 
     # concatenate existing solutions with new solutions
-    df_enu_total = pd.concat([df_enu_old, df_enu_new], axis=0)
-
-    # detect all dublicates and only keep last dublicated entries
-    df_enu = df_enu_total[~df_enu_total.index.duplicated(keep='last')]
+    df_enu_total = pd.concat([df_enu_old] + enu_list, axis=0, copy=False)
+    if df_enu_total.empty:
+        # no old and no new solutions: empty dataframe with the solution columns and a datetimeindex
+        df_enu_total = pd.DataFrame(columns=['U', 'amb_state', 'nr_sat', 'std_u'],
+                                    index=pd.DatetimeIndex([], name='date_time'))
+
+    # detect all dublicates and only keep last dublicated entries (single pass over sorted timestamps, no hashing)
+    df_enu_total = df_enu_total.sort_index(kind='stable')
+    ts = df_enu_total.index.asi8
+    keep = np.ones(len(ts), dtype=bool)
+    keep[:-1] = ts[1:] != ts[:-1]
+    df_enu = df_enu_total.iloc[keep]
     print(colored('\nstored all old and new ENU solution data (without dublicates) in dataframe df_enu:', 'blue'))
     print(df_enu)
 
-    # store dataframe as binary pickle format
-    df_enu.to_pickle(dest_path + '20_solutions/' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl')
+    # Q: downcast dtypes (amb_state in [1, 2, 5], nr_sat < 64) to reduce memory and pickle size,
+    # nullable integers keep epochs with missing values (NaN)
+    df_enu = df_enu.astype({'U': 'float32', 'std_u': 'float32', 'amb_state': 'Int8', 'nr_sat': 'Int8'}, copy=False)
+
+    # store dataframe as zstd compressed parquet
+    write_parquet(df_enu, path_to_oldpickle)
     print(colored(
-        '\nstored all old and new ENU solution data (without dublicates) in pickle: '
-        + '20_solutions/' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl', 'blue'))
+        '\nstored all old and new ENU solution data (without dublicates) in parquet: '
+        + '20_solutions/' + rover_name + '_' + base_name + '_' + resolution + ending + '.parquet', 'blue'))
+
+    # move files from temp directory to solutions directory only after the solutions are stored
+    for file in files:
+        os.replace(file, os.path.join(sol_dir, os.path.basename(file)))
 
     # delete temporary solution directory
     if os.path.exists(path):
@@ -1215,44 +1446,36 @@ def filter_rtklib_solutions(dest_path, rover_name, base_name, baseline_length, r
     # Q: adjust for snow mast heightening (approx. 3m elevated several times a year)
     print('\ndata is corrected for snow mast heightening events (remove sudden jumps > 1m)')
 
-    # find positive jumps (followed by a negative jump) that would be detected as snow-mast-heightening but are outliers
-    jump_or_outlier = u[(u.diff() > 1000)]
-    for i, j in enumerate(jump_or_outlier):
-        # grap the next row after detected jump
-        next_line = u[u.index > jump_or_outlier.index[i]].head(1)
-        # check if this is really an outlier (data switches back to values from before) or a data jump (stays at similar values)
-        if next_line[0] < jump_or_outlier[i] - 1000:
-            # delete if outlier
-            u = u.drop(jump_or_outlier.index[i])
+    # find positive jumps (followed by a negative jump) that would be detected as snow-mast-heightening but are outliers:
+    # check if this is really an outlier (data switches back to values from before) or a data jump (stays at similar values)
+    values = u.to_numpy()
+    diff = np.diff(values, prepend=np.nan)
+    next_values = np.append(values[1:], np.nan)
+    u = u[~((diff > 1000) & (next_values < values - 1000))]     # delete if outlier
 
     # find negative jumps (followed by a positive jump)
-    value_after_jump = u[(u.diff() < -1000)]
-    for i, j in enumerate(value_after_jump):
-        next_line = u[u.index > value_after_jump.index[i]].head(1)
-        if next_line[0] > value_after_jump[i]+1000:
-            u = u.drop(value_after_jump.index[i])
+    values = u.to_numpy()
+    diff = np.diff(values, prepend=np.nan)
+    next_values = np.append(values[1:], np.nan)
+    u = u[~((diff < -1000) & (next_values > values + 1000))]
 
     # After erasing outliers/false SMH-jumps, find true SMH-jumps
-    jump = u.diff()[(u.diff() < -1000)]
-
-    # get value of jump difference (of values directly after - before jump)
-    jump_ind = jump.index.format()[0]
-    jump_val = u[jump_ind] - u[:jump_ind][-2]
+    # and get value of jump difference (of values directly after - before jump)
+    diff = np.diff(u.to_numpy(), prepend=np.nan)
+    jumps = diff < -1000
+    for jump_date, jump_val in zip(u.index[jumps], diff[jumps]):
+        print('\njump of %s mm height is detected! at %s' % (jump_val, jump_date))
 
-    while jump.empty is False:
-        print('\njump of %s mm height is detected! at %s' % (jump_val, jump.index.format()[0]))
-        adj = u[(u.index >= jump.index.format()[0])] - jump_val  # correct all observations after jump [0]
-        u = pd.concat([u[~(u.index >= jump.index.format()[0])],
-                       adj])  # concatenate all original obs before jump with adjusted values after jump
-        jump = u.diff()[(u.diff() < -1000)]
+    # correct all observations after each jump by the (cumulated) jump values
+    u = u - np.cumsum(np.where(jumps, diff, 0))
 
     print('\nno jump detected!')
 
     # Q: remove outliers based on x*sigma threshold
     print('\nremove outliers based on %s * sigma threshold' % threshold)
-    upper_limit = u.rolling('3D').median() + threshold * u.rolling('3D').std()
-    lower_limit = u.rolling('3D').median() - threshold * u.rolling('3D').std()
-    u_clean = u[(u > lower_limit) & (u < upper_limit)]
+    median_3d, std_3d = rolling_median_std(u, '3D')
+    # single pass: lower_limit < u < upper_limit  <=>  |u - median| < threshold * std
+    u_clean = u[np.abs(u.to_numpy() - median_3d.to_numpy()) < threshold * std_3d.to_numpy()]
 
     # Q: correct values to be positive values by subtracting length of true baseline
     swe_gnss = u_clean - baseline_length
@@ -1261,24 +1484,23 @@ def filter_rtklib_solutions(dest_path, rover_name, base_name, baseline_length, r
 
     # Q: filter data with a rolling median
     print('\ndata is median filtered with window length: %s' % window)
-    swe_gnss_fil = swe_gnss.rolling(window).median()
-    std_gnss_fil = swe_gnss.rolling(window).std()
+    swe_gnss_fil, std_gnss_fil = rolling_median_std(swe_gnss, window)
 
     # resample data per day, calculate median and standard deviation (noise) per day to fit manual reference data
-    swe_gnss_daily = swe_gnss.resample('D').median()
-    std_gnss_daily = swe_gnss.resample('D').std()
+    resampled_daily = swe_gnss.resample('D')
+    swe_gnss_daily, std_gnss_daily = resampled_daily.median(), resampled_daily.std()
     std_gnss_mean = std_gnss_daily.mean()
     std_gnss_percentual = std_gnss_daily * 100 / swe_gnss_daily
     std_gnss_percentual_mean = std_gnss_percentual.mean()
     print('\nThe daily noise of %s - %s solution (mean of standard deviation of 15min solution from daily mean):'
           '%s kg/m2 (%s %%)' % (base_name, rover_name, std_gnss_mean, std_gnss_percentual_mean))
 
-    # Q: store swe results to pickle
+    # Q: store swe results to parquet
     print(colored(
-        '\ndata is filtered, cleaned, and corrected and SWE results are stored to pickle and .csv: %s' % '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl',
+        '\ndata is filtered, cleaned, and corrected and SWE results are stored to parquet and .csv: %s' % '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.parquet',
         'blue'))
     os.makedirs(dest_path + '20_solutions/SWE_results/', exist_ok=True)
-    swe_gnss.to_pickle(
+    write_parquet(swe_gnss.to_frame(name='swe_gnss'),
         dest_path + '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl')
     swe_gnss.to_csv(dest_path + '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.csv')
 
@@ -1286,13 +1508,15 @@ def filter_rtklib_solutions(dest_path, rover_name, base_name, baseline_length, r
 
 
 def read_swe_gnss(dest_path, swe_gnss, rover_name, resolution, ending, base_name):
-    # read gnss swe results from pickle
+    # read gnss swe results from parquet (or legacy pickle)
     if swe_gnss is None:
         print(colored(
-            '\nSWE results are NOT available, reading from pickle: %s' % '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl',
+            '\nSWE results are NOT available, reading from parquet: %s' % '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.parquet',
             'orange'))
-        swe_gnss = pd.read_pickle(
+        swe_gnss = read_parquet(
             dest_path + '20_solutions/SWE_results/swe_gnss_' + rover_name + '_' + base_name + '_' + resolution + ending + '.pkl')
+        if isinstance(swe_gnss, pd.DataFrame):
+            swe_gnss = swe_gnss.squeeze(axis=1)
 
     return swe_gnss
 
@@ -1348,14 +1572,16 @@ def read_snowbuoy_observations(dest_path, url, ipol_density=None):
     os.makedirs(loc_buoy_dir, exist_ok=True)
 
     # Q: download newest snow buoy data from url
-    # get data from url
-    r = requests.get(url, allow_redirects=True)
+    # get data from url, stream download in chunks to a temporary file (kept in memory up to 16 MB, spilled to disk above)
+    with tempfile.SpooledTemporaryFile(max_size=16 << 20) as tmp:
+        with requests.get(url, allow_redirects=True, stream=True) as r:
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                tmp.write(chunk)
+        tmp.seek(0)
 
-    # decompress file
-    z = zipfile.ZipFile(io.BytesIO(r.content))
-
-    # store selected file from decompressed folder to working direcory subfolder
-    z.extract(z.filelist[2], path=loc_buoy_dir)
+        # decompress file and store selected file from decompressed folder to working direcory subfolder
+        with zipfile.ZipFile(tmp) as z:
+            z.extract(z.filelist[2], path=loc_buoy_dir)
 
     # Q: read snow buoy data
     print('\nread snow buoy observations')
@@ -1374,10 +1600,11 @@ def read_snowbuoy_observations(dest_path, url, ipol_density=None):
     jump_val = 1036
 
     print('\ncorrect jump of height %s: at %s' % (jump_val, jump_ind))
-    adj = buoy[['sh1', 'sh2', 'sh3', 'sh4']][
-              (buoy.index >= jump_ind)] + jump_val  # correct all observations after jump [0]
-    buoy_corr = pd.concat([buoy[['sh1', 'sh2', 'sh3', 'sh4']][~(buoy.index >= jump_ind)],
-                           adj])  # concatenate all original obs before jump with adjusted values after jump
+    # correct all observations after jump [0] in a single copy with a boolean mask
+    after_jump = buoy.index >= pd.Timestamp(jump_ind)
+    sh = buoy[['sh1', 'sh2', 'sh3', 'sh4']].to_numpy(dtype=np.float64, copy=True)
+    sh[after_jump] += jump_val
+    buoy_corr = pd.DataFrame(sh, index=buoy.index, columns=['sh1', 'sh2', 'sh3', 'sh4'])
 
     # Q: Differences in accumulation & conversion to SWE
     # calculate change in accumulation (in mm) for each buoy sensor add it as an additional column to the dataframe buoy
@@ -1426,8 +1653,71 @@ def read_pole_observations(dest_path, ipol_density=None):
 
     return poles
 
+def list_dated_files(pattern, start=2, end=8):
+    """ list files matching a glob pattern with the date encoded in their names, parsed once per file
+    :param pattern: glob pattern of the files, e.g. loc_mob_dir + 'nm*.val'
+    :param start: start position of the date in the file name (e.g. 'nm230218.val' -> 2)
+    :param end: end position of the date in the file name (e.g. 'nm230218.val' -> 8, 'nm2302.archive' -> 6)
+    :return: list of tuples (date as int, file path) sorted by date
+    """
+    return sorted((int(os.path.basename(file)[start:end]), file) for file in glob.iglob(pattern))
+
+
+def drop_duplicated_index(df):
+    """ drop rows with duplicated timestamps and keep the last one (like df[~df.index.duplicated(keep='last')]),
+        using numpy.unique on the int64 timestamps of the DatetimeIndex, the order of the kept rows is preserved
+    :param df: pandas dataframe (or series) with DatetimeIndex
+    :return: df without duplicated timestamps
+    """
+    if df.empty:
+        return df
+    timestamps = df.index.asi8
+    # first occurrence in the reversed timestamps = last occurrence in the original order
+    _, first_reversed = np.unique(timestamps[::-1], return_index=True)
+    return df.iloc[np.sort(len(timestamps) - 1 - first_reversed)]
+
+
 def has_numbers(inputString):
-    return any(char.isdigit() for char in inputString)
+    return DIGITS_RE.search(inputString) is not None
+
+
+# Q: pd.read_csv arguments of the three mob file formats (header changes on 230105 and 230218), built once
+# header NamesLong	2021-03-09 00:00:00	2023-01-05 00:00:00	"Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMT337 in T2 housing	Relative Humidity HMT337 in T10 housing	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Shortwave Downward Body Temperature	Shortwave Upward Body Temperature	Snow Level Height	Snow Level Sensor Signal Strength"
+MOB_READ_ARGS_V1 = {'header': 0, 'na_values': [-999.9], 'sep': r'\s+', 'dtype': {'datetime': str},
+                    'names': ['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMT337 in T2 housing', 'Relative Humidity HMT337 in T10 housing', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Shortwave Downward Body Temperature', 'Shortwave Upward Body Temperature', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
+                    'usecols': [0, 3, 17, 18, 19, 20, 21, 22, 23, 43], 'encoding': 'latin1', 'engine': 'c', 'dayfirst': True}
+# header NamesLong	2023-01-05 00:00:00	2023-02-18 00:00:00	"Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Shortwave Downward Body Temperature	Shortwave Upward Body Temperature	Snow Level Height	Snow Level Sensor Signal Strength"
+MOB_READ_ARGS_V2 = {'header': 0, 'na_values': [-999.9], 'sep': r'\s+', 'dtype': {'datetime': str},
+                    'names': ['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Shortwave Downward Body Temperature', 'Shortwave Upward Body Temperature', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
+                    'usecols': [0, 3, 17, 18, 19, 20, 21, 22, 23, 41], 'encoding': 'latin1', 'engine': 'c'}
+# header NamesLong	2023-02-18 00:00:00		                "Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Ventilation Temperature Mast	Ventilation Temperature GLC	Snow Level Height	Snow Level Sensor Signal Strength"
+MOB_READ_ARGS_V3 = {'header': 0, 'na_values': [-999.9], 'sep': r'\s+', 'dtype': {'datetime': str},
+                    'names': ['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Ventilation Temperature Mast', 'Ventilation Temperature GLC', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
+                    'usecols': [0, 3, 17, 18, 19, 20, 21, 22, 23, 41], 'encoding': 'latin1', 'engine': 'c'}
+
+
+def read_mob_file(file, file_date):
+    """ read a single meteorologic observation file (*.val) in the format valid for its date
+    :param file: path of mob file, e.g. 'nm230218.val'
+    :param file_date: date of the file name as int (yymmdd), e.g. 230218
+    :return: mob_new (pandas dataframe with datetimeindex)
+    """
+    print(file)
+
+    # check type of mob data format to read - new file header
+    if file_date < 230105:
+        read_args = MOB_READ_ARGS_V1
+    elif file_date < 230218:
+        read_args = MOB_READ_ARGS_V2
+    else:
+        read_args = MOB_READ_ARGS_V3
+    mob_new = pd.read_csv(file, **read_args)
+
+    # create datetime index
+    mob_new.datetime = str(file_date) + mob_new.datetime
+    mob_new.datetime = pd.to_datetime(mob_new['datetime'], format='%y%m%d%H:%M', cache=True)
+    return mob_new.set_index('datetime')
+
 
 def read_mob_data(dest_path, mob_path, yy, mob_pickle='nm_mob'):
     # create local directory for meteorlogic observations
@@ -1437,15 +1727,17 @@ def read_mob_data(dest_path, mob_path, yy, mob_pickle='nm_mob'):
     # Q: copy laser observations (*.val) from AWI server if not already existing
     print(colored("\ncopy new meteorologic observation files", 'blue'))
     # get list of yearly directories newer than first year
+    # (list local files only once instead of checking the existence of each file)
+    existing_files = set(os.listdir(loc_mob_dir))
     for year in os.listdir(mob_path):
-        if has_numbers(year) is True and int(year) >= int('20' + yy):
+        if year.isdigit() and int(year) >= int('20' + yy):
             # copy missing laser observation files
-            for f in glob.glob(mob_path + year + '/nm*.val'):
-                file = os.path.basename(f)
+            for file in list_files(mob_path + year, 'nm', '.val'):
+                f = mob_path + year + '/' + file
                 # skip files of 2021 before 26th nov (no gps data before installation)
                 if int(file[2:8]) >= 211101:
-                    if not os.path.exists(loc_mob_dir + file):
-                        shutil.copy2(f, loc_mob_dir)
+                    if file not in existing_files:
+                        copy_file_fast(f, loc_mob_dir + file)
                         print("file copied from %s to %s" % (f, loc_mob_dir))
                     else:
                         pass
@@ -1455,62 +1747,73 @@ def read_mob_data(dest_path, mob_path, yy, mob_pickle='nm_mob'):
             pass
     print(colored("\nnew meteorologic observation (mob) files copied", 'blue'))
 
-    # Q: read all existing laser observations from .pkl if already exists, else create empty dataframe
+    # Q: mob observations are stored as directory of parquet part files, each run only writes the newly read files
+    mob_parquet_dir = loc_mob_dir + mob_pickle + '_parquet/'
     path_to_oldpickle = loc_mob_dir + mob_pickle + '.pkl'
-    if os.path.exists(path_to_oldpickle):
-        print('\nReading already existing mob observations from pickle: %s' % path_to_oldpickle)
+    if os.path.exists(mob_parquet_dir) and os.listdir(mob_parquet_dir):
+        print('\nReading index of already existing mob observations from parquet: %s' % mob_parquet_dir)
+        old_idx = pd.read_parquet(mob_parquet_dir, engine='pyarrow', columns=[]).index.max().strftime("%y%m%d")
+    elif os.path.exists(path_to_oldpickle):
+        # convert legacy pickle to the first parquet part file
+        print('\nConverting already existing mob observations from pickle to parquet: %s' % path_to_oldpickle)
+        os.makedirs(mob_parquet_dir, exist_ok=True)
         mob = pd.read_pickle(path_to_oldpickle)
         old_idx = mob.index[-1].date().strftime("%y%m%d")
+        mob.to_parquet(mob_parquet_dir + mob_pickle + '_' + old_idx + '.parquet', engine='pyarrow', compression='zstd')
     else:
-        print(colored('\nCreating a mob observations pickle', 'yellow'))
-        mob = pd.DataFrame()
+        print(colored('\nCreating a mob observations parquet directory', 'yellow'))
+        os.makedirs(mob_parquet_dir, exist_ok=True)
         old_idx = '211101'
 
     # Q: read new files *.val, parse date and time columns to datetimeindex and add them to the dataframe
     print(colored('\nReading all new logfiles from: %s' % loc_mob_dir + 'nm*.val', 'blue'))
-    for file in glob.iglob(loc_mob_dir + 'nm*.val', recursive=True):
-        # read files newer than last entry in mob pickle
-        if int(os.path.basename(file)[2:8]) > int(old_idx):
-            print(file)
-
-            # check if type of mob data format to read - new file header
-            if int(os.path.basename(file)[2:8]) < 230105:
-                # header NamesLong	2021-03-09 00:00:00	2023-01-05 00:00:00	"Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMT337 in T2 housing	Relative Humidity HMT337 in T10 housing	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Shortwave Downward Body Temperature	Shortwave Upward Body Temperature	Snow Level Height	Snow Level Sensor Signal Strength"
-                mob_new = pd.read_csv(file, header=0, na_values=[-999.9], delim_whitespace=True,
-                                      names=['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMT337 in T2 housing', 'Relative Humidity HMT337 in T10 housing', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Shortwave Downward Body Temperature', 'Shortwave Upward Body Temperature', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
-                                      usecols=[0, 3, 17, 18, 19, 20, 21, 22, 23, 43],
-                                      encoding='latin1', engine='python', dayfirst=True)
-            elif int(os.path.basename(file)[2:8]) >= 230105 and int(os.path.basename(file)[2:8]) <	230218:
-                # header NamesLong	2023-01-05 00:00:00	2023-02-18 00:00:00	"Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Shortwave Downward Body Temperature	Shortwave Upward Body Temperature	Snow Level Height	Snow Level Sensor Signal Strength"
-                mob_new = pd.read_csv(file, header=0, na_values=[-999.9], delim_whitespace=True,
-                                      names=['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Shortwave Downward Body Temperature', 'Shortwave Upward Body Temperature', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
-                                      usecols=[0, 3, 17, 18, 19, 20, 21, 22, 23, 41],
-                                      encoding='latin1', engine='python')
-            elif int(os.path.basename(file)[2:8]) >= 230218:
-                # header NamesLong	2023-02-18 00:00:00		                "Hour:Minute	Cloud Ceiling	Visibility	Sunshine Indicator	Shortwave Downward Radiant Energy Flux Density	Shortwave Upward Radiant Energy Flux Density	RG8 Filtered Downward Radiant Energy Flux Density	OG1 Filtered Downward Radiant Energy Flux Density	Diffuse Shortwave Downward Radiant Energy Flux Density	Direct Shortwave Downward Radiant Energy Flux Density	UV Filtered Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density	Longwave Downward Radiant Energy Flux Density CGR4	Longwave Upward Radiant Energy Flux Density	Longwave Downward Body Temperature	Cgr4 Longwave Upward Body Temperature	Longwave Upward Body Temperature	2m Level Wind Speed	2m Level Wind Direction	10m Level Wind Speed	2m Level Wind Direction	10m Level Gust Wind Speed	2m Level Temperature	10m Level Temperature	Relative Humidity HMP155T2	Relative Humidity HMP155T10	Air Pressure	Air Pressure	Air Pressure	Longwave Downward Dome Temperature 1	Longwave Downward Dome Temperature 2	Longwave Downward Dome Temperature 3	Longwave Upward Dome Temperature 1	Longwave Upward Dome Temperature 2	Longwave Upward Dome Temperature 3	not in use	not in use	not in use	Direct Shortwave Downward Body Temperature	Ventilation Temperature Mast	Ventilation Temperature GLC	Snow Level Height	Snow Level Sensor Signal Strength"
-                mob_new = pd.read_csv(file, header=0, na_values=[-999.9], delim_whitespace=True,
-                                      names=['datetime', 'Cloud Ceiling', 'Visibility', 'Sunshine Indicator', 'Shortwave Downward Radiant Energy Flux Density', 'Shortwave Upward Radiant Energy Flux Density', 'RG8 Filtered Downward Radiant Energy Flux Density', 'OG1 Filtered Downward Radiant Energy Flux Density', 'Diffuse Shortwave Downward Radiant Energy Flux Density', 'Direct Shortwave Downward Radiant Energy Flux Density', 'UV Filtered Downward Radiant Energy Flux Density', 'Longwave Downward Radiant Energy Flux Density1', 'Longwave Downward Radiant Energy Flux Density2', 'Longwave Upward Radiant Energy Flux Density', 'Longwave Downward Body Temperature', 'Cgr4 Longwave Upward Body Temperature', 'Longwave Upward Body Temperature', '2m Level Wind Speed', '2m Level Wind Direction', '10m Level Wind Speed', '10m Level Wind Direction', '10m Level Gust Wind Speed', '2m Level Temperature', '10m Level Temperature', 'Relative Humidity HMP155T2', 'Relative Humidity HMP155T10', 'Air Pressure 1', 'Air Pressure 2', 'Air Pressure 3', 'Longwave Downward Dome Temperature 1', 'Longwave Downward Dome Temperature 2', 'Longwave Downward Dome Temperature 3', 'Longwave Upward Dome Temperature 1', 'Longwave Upward Dome Temperature 2', 'Longwave Upward Dome Temperature 3', 'not in use 1', 'not in use 2', 'not in use 3', 'Direct Shortwave Downward Body Temperature', 'Ventilation Temperature Mast', 'Ventilation Temperature GLC', 'Snow Level Height', 'Snow Level Sensor Signal Strength'],
-                                      usecols=[0, 3, 17, 18, 19, 20, 21, 22, 23, 41],
-                                      encoding='latin1', engine='python')
-
-            # create datetime index
-            mob_new.datetime = os.path.basename(file)[2:8] + mob_new.datetime
-            mob_new.datetime = pd.to_datetime(mob_new['datetime'], format='%y%m%d%H:%M')
-            mob_new = mob_new.set_index('datetime')
-            # add loaded file to existing mob df
-            mob = pd.concat([mob, mob_new], axis=0)
+    # read files newer than last entry in mob parquet, the files are independent: parse them in parallel
+    old_date = int(old_idx)
+    new_files = [(file_date, file) for file_date, file in list_dated_files(loc_mob_dir + 'nm*.val') if file_date > old_date]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        mob_list = list(executor.map(lambda dated_file: read_mob_file(dated_file[1], dated_file[0]), new_files))
+
+    # store only the new observations as additional part file (named by last date, so parts sort chronologically)
+    if mob_list:
+        mob_new = pd.concat(mob_list, axis=0, copy=False)
+        mob_new = drop_duplicated_index(mob_new)
+        part_file = mob_parquet_dir + mob_pickle + '_' + mob_new.index[-1].strftime("%y%m%d") + '.parquet'
+        mob_new.to_parquet(part_file, engine='pyarrow', compression='zstd')
+        print('\nstored new mob observations to parquet: %s' % part_file)
+
+    # read all parts, detect all dublicates and only keep last dublicated entries
+    if os.listdir(mob_parquet_dir):
+        mob = pd.read_parquet(mob_parquet_dir, engine='pyarrow', use_threads=True)
+        mob = drop_duplicated_index(mob)
+    else:
+        mob = pd.DataFrame()
 
-        else:
-            continue
+    return mob
 
-    # detect all dublicates and only keep last dublicated entries
-    mob = mob[~mob.index.duplicated(keep='last')]
 
-    # store as .pkl
-    mob.to_pickle(loc_mob_dir + mob_pickle + '.pkl')
-    print('\nstored all old and new mob observations (without dublicates) to pickle: %s' + loc_mob_dir + mob_pickle + '.pkl')
+def read_synop_file(file):
+    """ read a single synoptic observation file (*.archive), only the present weather (ww) condition is kept
+    :param file: path of SYNOP file, e.g. 'nm2111.archive'
+    :return: synop_new (pandas dataframe with datetimeindex and column 'ww', empty if the file contains no observations)
+    """
+    print(file)
 
-    return mob
+    # only save present weather (ww) condition in dataframe
+    synop_new = pd.read_csv(file, header=0, na_values=['7////'], sep=r'\s+',
+                          names=['date', 'AAXX', 'time', 'station number', '42999', '42209', 'T', '21075', '39730', '49786', '57004', 'ww', '83031', 'new set', '10006', '21061', '929//', '/////'],
+                          usecols=[0, 2, 11], dtype={'date': str, 'time': str},
+                          encoding='latin1', engine='c')
+    if synop_new.empty is True:
+        return synop_new
+
+    # create datetime index from 'yymm' date and 'ddhh' time (without last digit: wind indicator)
+    synop_new['date_time'] = pd.to_datetime(synop_new['date'] + ' ' + synop_new['time'].str[:-1],
+                                            format='%y%m %d%H', cache=True)
+    synop_new = synop_new.drop(columns=['date', 'time']).set_index('date_time')
+    # take only numbers that represent weather
+    synop_new['ww'] = synop_new['ww'].astype(str).str[1:-4]
+    synop_new['ww'] = pd.to_numeric(synop_new.ww)
+    return synop_new
 
 
 def read_SYNOP_data(dest_path, synop_path, yy, pickle='nm_SYNOP'):
@@ -1521,15 +1824,17 @@ def read_SYNOP_data(dest_path, synop_path, yy, pickle='nm_SYNOP'):
     # Q: copy laser observations (*.val) from AWI server if not already existing
     print(colored("\ncopy new synoptic observation files", 'blue'))
     # get list of yearly directories newer than first year
+    # (list local files only once instead of checking the existence of each file)
+    existing_files = set(os.listdir(loc_synop_dir))
     for year in os.listdir(synop_path):
-        if has_numbers(year) is True and int(year) >= int('20' + yy):
+        if year.isdigit() and int(year) >= int('20' + yy):
             # copy missing laser observation files
-            for f in glob.glob(synop_path + year + '/nm*.archive'):
-                file = os.path.basename(f)
+            for file in list_files(synop_path + year, 'nm', '.archive'):
+                f = synop_path + year + '/' + file
                 # skip files of 2021 before 26th nov (no gps data before installation)
                 if int(file[2:6]) >= 2111:
-                    if not os.path.exists(loc_synop_dir + file):
-                        shutil.copy2(f, loc_synop_dir)
+                    if file not in existing_files:
+                        copy_file_fast(f, loc_synop_dir + file)
                         print("file copied from %s to %s" % (f, loc_synop_dir))
                     else:
                         pass
@@ -1541,56 +1846,119 @@ def read_SYNOP_data(dest_path, synop_path, yy, pickle='nm_SYNOP'):
 
     # Q: read all existing laser observations from .pkl if already exists, else create empty dataframe
     path_to_oldpickle = loc_synop_dir + pickle + '.pkl'
-    if os.path.exists(path_to_oldpickle):
-        print('\nReading already existing synoptic observations from pickle: %s' % path_to_oldpickle)
-        synop = pd.read_pickle(path_to_oldpickle)
+    synop = read_parquet(path_to_oldpickle)
+    if synop is not None:
+        print('\nReading already existing synoptic observations from parquet/pickle: %s' % path_to_oldpickle)
         old_idx = synop.index[-1].date().strftime("%y%m")
     else:
         print(colored('\nCreating a SYNOP observations pickle', 'yellow'))
         synop = pd.DataFrame()
         old_idx = '2110'
 
+    # Q: read list of already ingested files with their size and modification time (only valid with stored observations)
+    path_to_ingested = loc_synop_dir + pickle + '_files.json'
+    if not synop.empty and os.path.exists(path_to_ingested):
+        with open(path_to_ingested) as f:
+            ingested_files = json.load(f)
+    else:
+        ingested_files = {}
+
     # Q: read new files *.archive, parse date and time columns to datetimeindex and add them to the dataframe
     print(colored('\nReading all new logfiles from: %s' % loc_synop_dir + 'nm*.archive', 'blue'))
-    for file in glob.iglob(loc_synop_dir + 'nm*.archive', recursive=True):
+    new_files, file_signatures = [], {}
+    old_month = int(old_idx)
+    for file_month, file in list_dated_files(loc_synop_dir + 'nm*.archive', end=6):
         # read files newer than last entry in mob pickle
-        if int(os.path.basename(file)[2:6]) >= int(old_idx):
-            print(file)
-
-            # only save present weather (ww) condition in dataframe
-            synop_new = pd.read_csv(file, header=0, na_values=['7////'], delim_whitespace=True,
-                                  names=['date', 'AAXX', 'time', 'station number', '42999', '42209', 'T', '21075', '39730', '49786', '57004', 'ww', '83031', 'new set', '10006', '21061', '929//', '/////'],
-                                  usecols=[0, 2, 11], parse_dates=[['date', 'time']],
-                                  encoding='latin1', engine='python', dayfirst=True)
-
-            if synop_new.empty is True:
-                for f in glob.glob(loc_synop_dir + os.listdir(loc_synop_dir)[-2]):
-                    os.remove(f)
-            else:
-                # create datetime index
-                synop_new['date_time'] = synop_new['date_time'].astype(str).str[:-1]
-                synop_new['date_time'] = pd.to_datetime(synop_new['date_time'], format='%y%m %d%H')
-                synop_new = synop_new.set_index('date_time')
-                # take only numbers that represent weather
-                synop_new['ww'] = synop_new['ww'].astype(str).str[1:-4]
-                synop_new['ww'] = pd.to_numeric(synop_new.ww)
-                # add loaded file to existing mob df
-                synop = pd.concat([synop, synop_new], axis=0)
-
+        if file_month >= old_month:
+            # skip files that are unchanged since they were ingested (monthly archives are appended, so compare size and time)
+            file_stat = os.stat(file)
+            file_signatures[file] = [file_stat.st_size, file_stat.st_mtime_ns]
+            if ingested_files.get(os.path.basename(file)) != file_signatures[file]:
+                new_files.append(file)
+
+    # the files are independent: parse them in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        parsed_files = list(executor.map(read_synop_file, new_files))
+
+    synop_list = []
+    for file, synop_new in zip(new_files, parsed_files):
+        if synop_new.empty is True:
+            # remove the empty archive file itself (never one of the parquet/json store files in the same directory)
+            if os.path.exists(file):
+                os.remove(file)
+            # and drop it from the ingested files, a later archive with the same name is read again
+            ingested_files.pop(os.path.basename(file), None)
         else:
-            continue
+            # collect loaded files, concatenated once with the existing synop df after the loop
+            synop_list.append(synop_new)
+            ingested_files[os.path.basename(file)] = file_signatures[file]
+    synop = pd.concat([synop] + synop_list, axis=0, copy=False, sort=False)
 
     # detect all dublicates and only keep last dublicated entries
-    synop = synop[~synop.index.duplicated(keep='last')]
+    synop = drop_duplicated_index(synop)
 
-    # store as .pkl
-    synop.to_pickle(loc_synop_dir + pickle + '.pkl')
-    print('\nstored all old and new mob observations (without dublicates) to pickle: %s' + loc_synop_dir + pickle + '.pkl')
+    # store as zstd compressed .parquet
+    print('\nstored all old and new synop observations (without dublicates) to parquet: %s' % write_parquet(synop, path_to_oldpickle))
+    with open(path_to_ingested, 'w') as f:
+        json.dump(ingested_files, f)
 
     return synop
 
 
 
+def normalize_delimiters(file, delimiters, encoding='latin1'):
+    """ read a text file with alternative delimiter characters (e.g. '>' or ';' besides ' ') and replace them by a space,
+        so that it can be parsed with the C engine of pd.read_csv (sep=' ') instead of a regex separator and the python engine.
+        Lines are stripped and every delimiter character is kept as one separator, like the regex split of the python engine.
+    :param file: path of the text file
+    :param delimiters: string of delimiter characters to replace by a space, e.g. '>'
+    :param encoding: encoding of the text file
+    :return: normalized file content as in-memory text stream
+    """
+    table = str.maketrans(dict.fromkeys(delimiters, ' '))
+    with open(file, encoding=encoding) as f:
+        return io.StringIO('\n'.join(line.strip().translate(table) for line in f))
+
+
+def read_laser_file(file, file_date):
+    """ read a single snow accumulation file (*.log: old sensor, *.shm: new sensor since 22-12-2022) of the laser distance sensor
+    :param file: path of laser file, e.g. 'nm221223.shm'
+    :param file_date: date of the file name as int (yymmdd), e.g. 221223
+    :return: shm (pandas dataframe with datetimeindex and columns 'sh', 'temp', 'error')
+    """
+    print(file)
+
+    # check if old or new type laser data format to read due to the installation of a new sensor on 22-12-2022
+    if file_date <= 221222:
+        # read all old-type snow accumulation.log files
+        # header: 'date', 'time', 'snow level (m)', 'signal(-)', 'temp (°C)', 'error (-)', 'checksum (-)'
+        shm = pd.read_csv(normalize_delimiters(file, '>'), header=0, sep=' ', na_values=["NaN"],
+                          names=['date', 'time', 'none', 'sh', 'signal', 'temp', 'error', 'check'],
+                          usecols=[0, 1, 3, 5, 6], dtype={'date': str, 'time': str},
+                          engine='c')
+        # create datetime index, parsed vectorized (format inferred once) with cache for repeated values
+        shm.index = pd.DatetimeIndex(pd.to_datetime(shm['date'] + ' ' + shm['time'], dayfirst=True, cache=True),
+                                     name='date_time')
+        shm = shm.drop(columns=['date', 'time'])
+    else:
+        # read all new-type snow accumulation.shm files
+        # header: Year	Month	Day	Hour	Minute	Second	Command	TelegramNumber	SerialNumber	SnowLevel	SnowSignal	Temperature	TiltAngle	Error	UmbStatus	Checksum	DistanceRaw	Unknown	Checksum660
+        shm = pd.read_csv(normalize_delimiters(file, ';'), header=0, sep=' ', na_values=["NaN"],
+                          names=['datetime', 'Command', 'TelegramNumber', 'SerialNumber', 'sh', 'signal',
+                                 'temp', 'TiltAngle', 'error', 'check'],
+                          usecols=[0, 4, 6, 8], dtype={'datetime': str},
+                          engine='c')
+        # create datetime index
+        shm = shm.set_index('datetime')
+        shm.index = pd.to_datetime(shm.index, cache=True)
+        # only select error infos in 'error' (first column)
+        shm['error'] = shm['error'].str.partition(':')[0]
+        # change outlier values ('///////') to NaN
+        shm[['sh', 'error']] = shm[['sh', 'error']].apply(pd.to_numeric, errors='coerce')
+
+    return shm
+
+
 def read_laser_observations(dest_path, laser_path, yy, laser_pickle='nm_laser'):
     """ read snow accumulation observations (minute resolution) from laser distance sensor data
     :param ipol: interpolated density data from manual reference observations
@@ -1605,15 +1973,17 @@ def read_laser_observations(dest_path, laser_path, yy, laser_pickle='nm_laser'):
     # Q: copy laser observations (*.log/shm = *.[ls]??) from AWI server if not already existing
     print(colored("\ncopy new laser files", 'blue'))
     # get list of yearly directories newer than first year
+    # (list local files only once instead of checking the existence of each file)
+    existing_files = set(os.listdir(loc_laser_dir))
     for year in os.listdir(laser_path)[:-1]:
         if int(year) >= int('20' + yy):
             # copy missing laser observation files
-            for f in glob.glob(laser_path + year + '/*.[ls]??'):
-                file = os.path.basename(f)
+            for file in expand_wildcards(laser_path + year, '*.[ls]??'):
+                f = laser_path + year + '/' + file
                 # skip files of 2021 before 26th nov (no gps data before installation)
                 if int(file[2:8]) >= 211101:
-                    if not os.path.exists(loc_laser_dir + file):
-                        shutil.copy2(f, loc_laser_dir)
+                    if file not in existing_files:
+                        copy_file_fast(f, loc_laser_dir + file)
                         print("file copied from %s to %s" % (f, loc_laser_dir))
                     else:
                         # print(colored("\nfile in destination already exists: %s, \ncopy aborted!!!" % dest_path, 'yellow'))
@@ -1626,9 +1996,9 @@ def read_laser_observations(dest_path, laser_path, yy, laser_pickle='nm_laser'):
 
     # Q: read all existing laser observations from .pkl if already exists, else create empty dataframe
     path_to_oldpickle = loc_laser_dir + laser_pickle + '.pkl'
-    if os.path.exists(path_to_oldpickle):
-        print(colored('\nReading already existing laser observations from pickle: %s' % path_to_oldpickle, 'yellow'))
-        laser = pd.read_pickle(path_to_oldpickle)
+    laser = read_parquet(path_to_oldpickle)
+    if laser is not None:
+        print(colored('\nReading already existing laser observations from parquet/pickle: %s' % path_to_oldpickle, 'yellow'))
         old_idx = laser.index[-1].date().strftime("%y%m%d")
     else:
         print(colored('\nNo existing laser observations pickle!', 'yellow'))
@@ -1637,51 +2007,22 @@ def read_laser_observations(dest_path, laser_path, yy, laser_pickle='nm_laser'):
 
     # Q: read new snow accumulation files *.[log/shm] (minute resolution) from laser distance sensor data, parse date and time columns to datetimeindex and add them to the dataframe
     print(colored('\nReading all new logfiles from: %s' % loc_laser_dir + 'nm*.[log/shm]', 'blue'))
-    for file in glob.iglob(loc_laser_dir + 'nm*.[ls]??', recursive=True):
-        # read accumulation files newer than last entry in laser pickle
-        if int(os.path.basename(file)[2:8]) > int(old_idx):
-            print(file)
-
-            # check if old or new type laser data format to read due to the installation of a new sensor on 22-12-2022
-            if int(os.path.basename(file)[2:8]) <= 221222:
-                # read all old-type snow accumulation.log files
-                # header: 'date', 'time', 'snow level (m)', 'signal(-)', 'temp (°C)', 'error (-)', 'checksum (-)'
-                shm = pd.read_csv(file, header=0, delimiter=r'[ >]', skipinitialspace=True, na_values=["NaN"],
-                                  names=['date', 'time', 'none', 'sh', 'signal', 'temp', 'error', 'check'],
-                                  usecols=[0, 1, 3, 5, 6],
-                                  encoding='latin1', parse_dates=[['date', 'time']], index_col=['date_time'],
-                                  engine='python', dayfirst=True)
-            else:
-                # read all new-type snow accumulation.shm files
-                # header: Year	Month	Day	Hour	Minute	Second	Command	TelegramNumber	SerialNumber	SnowLevel	SnowSignal	Temperature	TiltAngle	Error	UmbStatus	Checksum	DistanceRaw	Unknown	Checksum660
-                shm = pd.read_csv(file, header=0, delimiter=' |;', na_values=["NaN"],
-                                  names=['datetime', 'Command', 'TelegramNumber', 'SerialNumber', 'sh', 'signal',
-                                         'temp', 'TiltAngle', 'error', 'check'],
-                                  usecols=[0, 4, 6, 8],
-                                  encoding='latin1', parse_dates=['datetime'], index_col=0,
-                                  engine='python')
-                # only select error infos in 'error' (first column)
-                shm.error = shm.error.str.split(':', expand=True)[0]
-                # change outlier values ('///////') to NaN
-                shm.sh = pd.to_numeric(shm.sh, errors='coerce')
-                shm.error = pd.to_numeric(shm.error, errors='coerce')
-
-            # add loaded file to existing laser df
-            laser = pd.concat([laser, shm], axis=0)
-
-        else:
-            continue
+    # read accumulation files newer than last entry in laser pickle, the files are independent: parse them in parallel
+    old_date = int(old_idx)
+    new_files = [(file_date, file) for file_date, file in list_dated_files(loc_laser_dir + 'nm*.[ls]??') if file_date > old_date]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        laser_list = list(executor.map(lambda dated_file: read_laser_file(dated_file[1], dated_file[0]), new_files))
+    laser = pd.concat([laser] + laser_list, axis=0, copy=False, sort=False)
 
     # calculate change in accumulation (in mm) and add it as an additional column to the dataframe
-    laser['dsh'] = (laser['sh'] - laser['sh'][0]) * 1000
+    laser['dsh'] = (laser['sh'].to_numpy() - float(laser['sh'].iloc[0])) * 1000
 
     # detect all dublicates and only keep last dublicated entries
-    laser = laser[~laser.index.duplicated(keep='last')]
+    laser = drop_duplicated_index(laser)
 
-    # store as .pkl
-    laser.to_pickle(loc_laser_dir + laser_pickle + '.pkl')
+    # store as zstd compressed .parquet
     print(colored(
-        '\nstored all old and new laser observations (without dublicates) to pickle: %s' + loc_laser_dir + laser_pickle + '.pkl',
+        '\nstored all old and new laser observations (without dublicates) to parquet: %s' % write_parquet(laser, path_to_oldpickle),
         'blue'))
 
     return laser
@@ -1698,31 +2039,31 @@ def filter_laser_observations(ipol, laser, threshold=1):
     # Q: remove outliers in laser observations
     print('\n-- filtering laser observations')
     # 0. select only observations without errors
-    dsh = laser[(laser.error == 0)].dsh
+    # (select the column first, so that only dsh is copied and not the whole laser dataframe)
+    dsh = laser.dsh[(laser.error == 0)]
 
     # 1. remove huge outliers
     f = dsh[(dsh > dsh.min())]
 
     # 2. remove outliers based on an x sigma threshold
     print('\nremove outliers based on %s * sigma threshold' % threshold)
-    upper_limit = f.rolling('7D').median() + threshold * f.rolling('7D').std()
-    lower_limit = f.rolling('7D').median() - threshold * f.rolling('7D').std()
-    f_clean = f[(f > lower_limit) & (f < upper_limit)]
+    median_7d, std_7d = rolling_median_std(f, '7D')
+    f_clean = f[(f > median_7d - threshold * std_7d) & (f < median_7d + threshold * std_7d)]
 
     # 3. remove remaining outliers based on their gradient
     print('\nremove outliers based on gradient')
-    gradient = f_clean.diff()
-    outliers = f_clean.index[(gradient > 500) | (gradient < -500)]
-    while outliers.empty is False:
-        fil_dsh = f_clean.loc[~f_clean.index.isin(outliers)]
-        f_clean = fil_dsh
-        gradient = f_clean.diff()
-        outliers = f_clean.index[(gradient > 500) | (gradient < -500)]
+    # (iterate on positions of the remaining observations with numpy, remove all outliers of each pass at once)
+    values = f_clean.to_numpy()
+    remaining = np.arange(len(values))
+    outliers = np.abs(np.diff(values, prepend=np.nan)) > 500
+    while outliers.any():
+        remaining = remaining[~outliers]
+        outliers = np.abs(np.diff(values[remaining], prepend=np.nan)) > 500
+    f_clean = f_clean.iloc[remaining]
 
     # Q: filter observations
     print('\nmedian filtering')
-    laser_fil = f_clean.rolling('D').median()
-    laser_fil_std = f_clean.rolling('D').std()
+    laser_fil, laser_fil_std = rolling_median_std(f_clean, 'D')
 
     # Q: calculate SWE from accumulation data
     print('\n-- convert laser observations to SWE')
@@ -1751,7 +2092,7 @@ def read_reference_data(dest_path, laser_path, mob_path, synop_path, yy, url, re
     :param url: path to snow buoy data on a webpage
     :param yy: year to get first data
     :param laser_path: path to laser distance sensor observation files
-    :return: manual, ipol, buoy, poles, laser, laser_filtered
+    :return: dict of observations with keys 'manual', 'manual_NEW', 'ipol', 'buoy', 'poles', 'laser', 'laser_filtered', 'mob', 'synop'
     """
     print(colored('\n\nread reference observations', 'blue'))
 
@@ -1794,25 +2135,18 @@ def read_reference_data(dest_path, laser_path, mob_path, synop_path, yy, url, re
 
     print(colored('\n\nreference observations are loaded', 'blue'))
 
-    if read_laser is True and read_manual is False and read_buoy is False and read_poles is False and read_mob is False and read_synop is False:
-        return laser, laser_filtered
-    elif read_laser is False and read_manual is True and read_buoy is True and read_poles is True and read_mob is True and read_synop is True:
-        return manual, manual_NEW, ipol, buoy, poles, mob, synop
-    else:
-        return manual, manual_NEW, ipol, buoy, poles, laser, laser_filtered, mob, synop
+    # Q: return all observations by name (None if not read), the caller selects what it needs
+    return {'manual': manual, 'manual_NEW': manual_NEW, 'ipol': ipol, 'buoy': buoy, 'poles': poles, 'laser': laser,
+            'laser_filtered': laser_filtered, 'mob': mob, 'synop': synop}
 
 
 def calc_footprint(incident_angle):
     snowheight = np.linspace(0, 2, 201)
-    footprint_drysnow = func_footprint(snowheight, 1.32, incident_angle)
-    footprint_moistsnow = func_footprint(snowheight, 1.48, incident_angle)
-    footprint_wetsnow = func_footprint(snowheight, 1.81, incident_angle)
-    footprint_verywetsnow = func_footprint(snowheight, 2.3, incident_angle)
-    GNSS_refr_radius = pd.DataFrame(zip(snowheight * 100,
-                                        footprint_drysnow * 100,
-                                        footprint_moistsnow * 100,
-                                        footprint_wetsnow * 100,
-                                        footprint_verywetsnow * 100), columns=['h', 'r_ds', 'r_ms', 'r_ws', 'r_vws'])
+    # refractive indices of dry, moist, wet and very wet snow; footprint radius = h * footprint_factor(n, a)
+    refractive_indices = np.array([1.32, 1.48, 1.81, 2.3])
+    footprints = np.outer(snowheight, footprint_factor(refractive_indices, incident_angle))
+    GNSS_refr_radius = pd.DataFrame(np.column_stack([snowheight, footprints]) * 100,
+                                    columns=['h', 'r_ds', 'r_ms', 'r_ws', 'r_vws'])
     GNSS_refr_radius = GNSS_refr_radius.set_index(GNSS_refr_radius.h)
     return GNSS_refr_radius
 
@@ -1832,7 +2166,7 @@ def convert_swesh2density(swe, sh, rolling_median='3D'):
     density_fil = density
 
     # remove densities lower than the density of new snow (50 kg/m3) or higher than the density of firn (830 kg/m3) or ice (917 kg/m3)
-    density_cleaned = density_fil[~((density_fil < 50) | (density_fil >= 830))]
+    density_cleaned = density_fil[density_fil.between(50, 830, inclusive='left')]
 
     return density_cleaned
 
@@ -1877,7 +2211,8 @@ def convert_swe2sh(swe, ipol_density=None):
         sh = swe * 1000 / 408
     else:
         # calculate snow accumulation (sh) from SWE and interpolated density values (from manual Spuso observations)
-        sh = ((swe * 1000).divide(ipol_density, axis=0)).dropna()
+        # (density aligned to the swe epochs only, avoids an outer join with the minute-wise density index)
+        sh = ((swe * 1000).divide(ipol_density.reindex(swe.index), axis=0)).dropna()
 
     return sh
 
@@ -1893,7 +2228,8 @@ def convert_sh2swe(sh, ipol_density=None):
         swe = (sh / 1000) * 408
     else:
         # calculate SWE from snow accumulation (sh) and interpolated density values (from manual Spuso observations)
-        swe = ((sh / 1000).multiply(ipol_density, axis=0)).dropna()
+        # (density aligned to the sh epochs only, avoids an outer join with the minute-wise density index)
+        swe = ((sh / 1000).multiply(ipol_density.reindex(sh.index), axis=0)).dropna()
 
     return swe
 
@@ -1917,6 +2253,21 @@ def convert_swe2sh_gnss(swe_gnss, ipol_density=None):
 
     return gnss
 
+def resample_all(frames, interval='D', dropna=True):
+    """ resample observations of several sensors (different temporal resolutions) to one resolution, each frame once
+    :param frames: dict of dataframes, e.g. {'leica': gnss_leica, 'buoy': buoy}, frames that are None are skipped
+    :param interval: time interval for resampling, default=daily
+    :param dropna: drop intervals without observations (True) or keep them as NaN (False)
+    :return: dict of resampled (median) dataframes with the keys of the given frames that are not None
+    """
+    resampled = {}
+    for name, frame in frames.items():
+        if frame is not None:
+            frame_res = frame.resample(interval).median()
+            resampled[name] = frame_res.dropna() if dropna is True else frame_res
+    return resampled
+
+
 def resample_gnss(gnss_leica, gnss_emlid, interval='D'):
     """ resample all sensors observations (different temporal resolutions) to other resolution
     :param gnss_leica: dataframe containing GNSS solutions (SWE, sh) from high-end system
@@ -1925,14 +2276,11 @@ def resample_gnss(gnss_leica, gnss_emlid, interval='D'):
     :return: leica_res, emlid_res
     """
     # resample sh and swe data (daily)
-    if gnss_leica is not None:
-        leica_res = (gnss_leica.resample(interval).median()).dropna()
-    if gnss_emlid is not None:
-        emlid_res = (gnss_emlid.resample(interval).median()).dropna()
+    gnss_res = resample_all({'leica': gnss_leica, 'emlid': gnss_emlid}, interval)
 
     print('all gnss data is resampled with interval: %s' % interval)
 
-    return leica_res, emlid_res
+    return gnss_res.get('leica'), gnss_res.get('emlid')
 
 def resample_ref_obs(ref_df, interval='D'):
     """ resample all sensors observations (different temporal resolutions) to other resolution
@@ -1957,34 +2305,28 @@ def resample_allobs(gnss_leica, gnss_emlid, buoy=None, poles=None, laser=None, i
     :param interval: time interval for resampling, default=daily
     :return: leica_res, emlid_res, buoy_res, poles_res, laser_res
     """
-    # resample sh and swe data (daily)
-    leica_res = (gnss_leica.resample(interval).median()).dropna()
-    emlid_res = (gnss_emlid.resample(interval).median()).dropna()
-    if buoy is not None:
-        buoy_res = (buoy.resample(interval).median())
-    if poles is not None:
-        poles_res = (poles.resample(interval).median())
-    if laser is not None:
-        laser_res = (laser.resample(interval).median())
+    # resample sh and swe data (daily), each frame once; reference observations keep days without data as NaN
+    gnss_res = resample_all({'leica': gnss_leica, 'emlid': gnss_emlid}, interval)
+    ref_res = resample_all({'buoy': buoy, 'poles': poles, 'laser': laser}, interval, dropna=False)
 
     print('all data is resampled with interval: %s' % interval)
 
-    if buoy is not None and poles is not None and laser is not None:
-        return leica_res, emlid_res, buoy_res, poles_res, laser_res
-    elif buoy is None and poles is not None and laser is not None:
-        return leica_res, emlid_res, poles_res, laser_res
-    elif buoy is not None and poles is None and laser is not None:
-        return leica_res, emlid_res, buoy_res, laser_res
-    elif buoy is not None and poles is not None and laser is None:
-        return leica_res, emlid_res, buoy_res, poles_res
-    elif buoy is None and poles is None and laser is not None:
-        return leica_res, emlid_res, laser_res
-    elif buoy is not None and poles is None and laser is None:
-        return leica_res, emlid_res, buoy_res
-    elif buoy is None and poles is not None and laser is None:
-        return leica_res, emlid_res, poles_res
-    elif buoy is None and poles is None and laser is None:
-        return leica_res, emlid_res
+    # return the gnss solutions and all given reference observations (in the order buoy, poles, laser)
+    return (gnss_res['leica'], gnss_res['emlid']) + tuple(ref_res.values())
+
+
+def row_mean_std(df, columns):
+    """ calculate mean and standard deviation (ddof=1, like pandas) per row of selected columns on one numpy array,
+        NaN values are skipped, rows without (enough) values result in NaN
+    :param df: DataFrame containing the columns
+    :param columns: list of column names
+    :return: mean, std (numpy arrays)
+    """
+    values = df[columns].to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # Q: suppress 'Mean of empty slice' and 'Degrees of freedom <= 0' warnings of rows without values
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return np.nanmean(values, axis=1), np.nanstd(values, axis=1, ddof=1)
 
 
 def get_mean_and_std_deviation(df_poles, df_buoy):
@@ -1994,23 +2336,12 @@ def get_mean_and_std_deviation(df_poles, df_buoy):
     """
     # Calculate mean and standard deviation of snow height measurements (shm) and dSWE
     # of stake field (pole) measurements
-    df_poles['sh_mean'] = df_poles[
-        ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16']].mean(axis=1)
-    df_poles['sh_std'] = df_poles[
-        ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16']].std(axis=1)
-    df_poles['dswe_mean'] = df_poles[
-        ['dswe1', 'dswe2', 'dswe3', 'dswe4', 'dswe5', 'dswe6', 'dswe7', 'dswe8', 'dswe9', 'dswe10', 'dswe11', 'dswe12',
-         'dswe13', 'dswe14', 'dswe15', 'dswe16']].mean(axis=1)
-    df_poles['dswe_std'] = df_poles[
-        ['dswe1', 'dswe2', 'dswe3', 'dswe4', 'dswe5', 'dswe6', 'dswe7', 'dswe8', 'dswe9', 'dswe10', 'dswe11', 'dswe12',
-         'dswe13', 'dswe14', 'dswe15', 'dswe16']].std(axis=1)
+    df_poles['sh_mean'], df_poles['sh_std'] = row_mean_std(df_poles, [str(i) for i in range(1, 17)])
+    df_poles['dswe_mean'], df_poles['dswe_std'] = row_mean_std(df_poles, ['dswe' + str(i) for i in range(1, 17)])
     # of buoy measurements
-    df_buoy['sh_mean'] = df_buoy[['sh1', 'sh2', 'sh3', 'sh4']].mean(axis=1)
-    df_buoy['sh_std'] = df_buoy[['sh1', 'sh2', 'sh3', 'sh4']].std(axis=1)
-    df_buoy['dsh_mean'] = df_buoy[['dsh1', 'dsh2', 'dsh3', 'dsh4']].mean(axis=1)
-    df_buoy['dsh_std'] = df_buoy[['dsh1', 'dsh2', 'dsh3', 'dsh4']].std(axis=1)
-    df_buoy['dswe_mean'] = df_buoy[['dswe1', 'dswe2', 'dswe3', 'dswe4']].mean(axis=1)
-    df_buoy['dswe_std'] = df_buoy[['dswe1', 'dswe2', 'dswe3', 'dswe4']].std(axis=1)
+    df_buoy['sh_mean'], df_buoy['sh_std'] = row_mean_std(df_buoy, ['sh1', 'sh2', 'sh3', 'sh4'])
+    df_buoy['dsh_mean'], df_buoy['dsh_std'] = row_mean_std(df_buoy, ['dsh1', 'dsh2', 'dsh3', 'dsh4'])
+    df_buoy['dswe_mean'], df_buoy['dswe_std'] = row_mean_std(df_buoy, ['dswe1', 'dswe2', 'dswe3', 'dswe4'])
 
     return df_poles, df_buoy
 
@@ -2023,7 +2354,10 @@ def calculate_stats(title, reference_data, data, unit='kg/m2'):
     """
     # calculate residuals (Abweichung der Daten von der ermittelten Funktion)
     R = data - reference_data
-    R_p = ((data - reference_data)/reference_data)*100
+    R_p = (R / reference_data) * 100
+    # squared residuals, shared by MSE and SSR
+    R_squared_residuals = R**2
+    R_p_squared_residuals = R_p**2
     # number of samples (eg number of observations made on the same day)
     len = R.shape[0]
     # mean deviation (mean of all residuals)
@@ -2036,8 +2370,8 @@ def calculate_stats(title, reference_data, data, unit='kg/m2'):
     range = np.max(R) - np.min(R)
     range_p = np.max(R_p) - np.min(R_p)
     # variance (mean of squared residuals/error)
-    MSE = np.mean(R**2)
-    MSE_p = np.mean(R_p**2)
+    MSE = np.mean(R_squared_residuals)
+    MSE_p = np.mean(R_p_squared_residuals)
     # root mean square error (residuals) = standard deviation
     RMSE = MSE**0.5
     RMSE_p = MSE_p**0.5
@@ -2045,7 +2379,7 @@ def calculate_stats(title, reference_data, data, unit='kg/m2'):
     std = np.std(R)
     std_p = np.std(R_p)
     # sum of squared residuals
-    SSR = np.sum(R**2)
+    SSR = np.sum(R_squared_residuals)
     # Total sum of squared residuals (totale Varianz der y-daten)
     TSS = np.sum((data-np.mean(data))**2)
     # calculate R²
@@ -2139,27 +2473,16 @@ def create_new_df(x_data, x_data_name, y_data, y_data_name, y_data2=None, y_data
     :param y_data: time series with same index as x_data
     :param x_data_name: name of x-data
     :param y_data_name: name of y-data
-    """
-    if y_data2 is None and y_data3 is None and y_data4 is None:
-        dataframe = pd.concat([x_data, y_data], axis=1)
-        dataframe = dataframe.dropna()
-        dataframe.columns = [x_data_name, y_data_name]
-        df_x_index = dataframe.set_index(x_data_name)
-    elif y_data3 is None and y_data4 is None:
-        dataframe = pd.concat([x_data, y_data, y_data2], axis=1)
-        dataframe.columns = [x_data_name, y_data_name, y_data2_name]
-        dataframe = dataframe.dropna()
-        df_x_index = dataframe.set_index(x_data_name)
-    elif y_data4 is None:
-        dataframe = pd.concat([x_data, y_data, y_data2, y_data3], axis=1)
-        dataframe.columns = [x_data_name, y_data_name, y_data2_name, y_data3_name]
-        dataframe = dataframe.dropna()
-        df_x_index = dataframe.set_index(x_data_name)
-    else:
-        dataframe = pd.concat([x_data, y_data, y_data2, y_data3, y_data4], axis=1)
-        dataframe.columns = [x_data_name, y_data_name, y_data2_name, y_data3_name, y_data4_name]
-        dataframe = dataframe.dropna()
-        df_x_index = dataframe.set_index(x_data_name)
+    :param y_data2/3/4, y_data2/3/4_name: optional further time series and their names
+    :return: dataframe with datetime index (rows with NaNs dropped), same dataframe with x_data as index
+    """
+    # Q: keep only the given series and concat them once
+    pairs = [(x_data, x_data_name), (y_data, y_data_name), (y_data2, y_data2_name), (y_data3, y_data3_name), (y_data4, y_data4_name)]
+    pairs = [(data, name) for data, name in pairs if data is not None]
+    dataframe = pd.concat([data for data, name in pairs], axis=1)
+    dataframe.columns = [name for data, name in pairs]
+    dataframe = dataframe.dropna()
+    df_x_index = dataframe.set_index(x_data_name)
     return dataframe, df_x_index
 
 
@@ -2168,20 +2491,23 @@ def calculate_linearfit(dataframe, x_data_name, y_data_name):
     :param dataframe: dataframe containing y-data as index and x-data as first column
     :return: 3D array with array[0]=x-values, array[1]=y-values of fit, array[2]=fit parameters
     """
-    x_data = dataframe[x_data_name]
-    y_data = dataframe[y_data_name]
+    x_data = dataframe[x_data_name].to_numpy(dtype=float)
+    y_data = dataframe[y_data_name].to_numpy(dtype=float)
 
-    # calculate linear fit
-    fit_param = np.polyfit(x_data, y_data, 1)
+    # calculate linear fit (closed-form least squares of slope m and intercept b)
+    x_dev = x_data - x_data.mean()
+    m = np.dot(x_dev, y_data - y_data.mean()) / np.dot(x_dev, x_dev)
+    b = y_data.mean() - m * x_data.mean()
+    fit_param = np.array([m, b])
     print('Linear fit:'
           'm =', fit_param[0].round(2),
           ',b =', fit_param[1].round(3))
 
     # array of y-data of linear fit
-    data_fit = func_linear(x_data, fit_param[0], fit_param[1])
+    data_fit = m * x_data + b
     # create a 3D array for plotting the fitted curve by add x-values and function parameters
     # -> array[0]=x-values, array[1]=y-values, array[2]=function params
-    x_y_fit = [np.array(x_data), data_fit, fit_param]
+    x_y_fit = [x_data, data_fit, fit_param]
 
     return x_y_fit
 
@@ -2189,11 +2515,10 @@ def calculate_linearfit(dataframe, x_data_name, y_data_name):
 def solution_control(amb_state, std_gnss_daily, std_guess):
 
     # manual fit
-    x_values = np.linspace(1, 96, 951)
-    func_exp = func_exp3(x_values, std_guess)
-    func_exp = [x_values, func_exp, std_guess]
+    func_exp = [SOLUTION_CONTROL_N, std_guess * SOLUTION_CONTROL_INV_SQRT_N, std_guess]
 
-    nr_fixed = amb_state[(amb_state == 1)].resample('D').count()
+    # Q: count fixed epochs per day without building a filtered copy of amb_state
+    nr_fixed = amb_state.eq(1).resample('D').sum().astype('int32')
     amb_std_datetime, amb_std = create_new_df(nr_fixed, 'Number of fixed ambiguities', std_gnss_daily, 'Daily Noise')
     amb_std = amb_std.sort_values(by='Number of fixed ambiguities')
     # exponential regression
@@ -2210,32 +2535,58 @@ def solution_control(amb_state, std_gnss_daily, std_guess):
 def func_linear(x, m, b):
     return m * x + b
 
+def footprint_factor(n, a):
+    """
+    n: refractive index of snow (scalar or array)
+    a: angle of incidence
+    """
+    return np.tan(np.arcsin(np.sin(np.deg2rad(a))/n))
+
 def func_footprint(h, n, a):
     """
-    h: snowheight
+    h: snowheight (scalar or array)
     n: refractive index of snow
     a: angle of incidence
     """
-    return h*(math.tan(math.asin(math.sin(math.radians(a))/n)))
+    return h*footprint_factor(n, a)
 
 
 def func_err_prop_single(a, b, c, m_err, h_err):
     h = np.linspace(0, 10, 1001)
     m = func_exp(h, a, b, c)
     density = m / h
-    rel_err = np.sqrt((m_err/m)**2+(h_err/h)**2)
-    abs_err = rel_err * density
-    error = pd.DataFrame(zip(h, rel_err, abs_err), columns=['h', 'rel_m'+str(m_err)+'_h'+''.join(str(h_err).split('.')), 'abs_m'+str(m_err)+'_h'+''.join(str(h_err).split('.'))])
-    error = error.set_index(error.h)
+    # Q: relative error sqrt((m_err/m)² + (h_err/h)²) with in-place operations to avoid temporaries
+    rel_err = m_err / m
+    rel_err *= rel_err
+    h_term = h_err / h
+    h_term *= h_term
+    rel_err += h_term
+    np.sqrt(rel_err, out=rel_err)
+    abs_err = np.multiply(rel_err, density, out=density)
+    suffix = 'm'+str(m_err)+'_h'+''.join(str(h_err).split('.'))
+    error = pd.DataFrame({'h': h, 'rel_'+suffix: rel_err, 'abs_'+suffix: abs_err}, index=pd.Index(h, name='h'))
     return error
 
 
 def func_err_prop(a, b, c, m_err1, m_err2, m_err3, m_err4, h_err1, h_err2, h_err3, h_err4):
-    error1 = func_err_prop_single(a, b, c, m_err1, h_err1)
-    error2 = func_err_prop_single(a, b, c, m_err2, h_err2)
-    error3 = func_err_prop_single(a, b, c, m_err3, h_err3)
-    error4 = func_err_prop_single(a, b, c, m_err4, h_err4)
-    error = pd.concat([error1, error2, error3, error4], axis=1)
+    # Q: evaluate h and m once and broadcast the four (m_err, h_err) pairs over a (4, 1001) grid
+    h = np.linspace(0, 10, 1001)
+    m = func_exp(h, a, b, c)
+    density = m / h
+    m_errs = [m_err1, m_err2, m_err3, m_err4]
+    h_errs = [h_err1, h_err2, h_err3, h_err4]
+    rel_err = np.sqrt((np.array(m_errs)[:, None]/m)**2+(np.array(h_errs)[:, None]/h)**2)
+    # Q: fill one preallocated (1001, 9) array: h, then rel and abs error of each pair
+    out = np.empty((len(h), 1 + 2*len(m_errs)))
+    out[:, 0] = h
+    out[:, 1::2] = rel_err.T
+    np.multiply(out[:, 1::2], density[:, None], out=out[:, 2::2])
+    # Q: one dataframe with the same column names as func_err_prop_single, no intermediate concat
+    columns = ['h']
+    for m_err, h_err in zip(m_errs, h_errs):
+        suffix = 'm'+str(m_err)+'_h'+''.join(str(h_err).split('.'))
+        columns += ['rel_'+suffix, 'abs_'+suffix]
+    error = pd.DataFrame(out, columns=columns, index=pd.Index(h, name='h'))
     return error
 
 
@@ -2243,40 +2594,70 @@ def func_err_prop2(a, b, c, m_err, h_err, density1, density2, density3, density4
     # define h and m
     h = np.linspace(0, 10, 1001)
     m = func_exp(h, a, b, c)
-    # caluclate relative error
-    rel_err = np.sqrt((m_err/m)**2+(h_err/h)**2)
-    # calculate absolute error
-    abs_err1 = rel_err * density1
-    abs_err2 = rel_err * density2
-    abs_err3 = rel_err * density3
-    abs_err4 = rel_err * density4
+    # caluclate relative error (in place, see func_err_prop_single)
+    rel_err = m_err / m
+    rel_err *= rel_err
+    h_term = h_err / h
+    h_term *= h_term
+    rel_err += h_term
+    np.sqrt(rel_err, out=rel_err)
+    # calculate absolute error for all four densities in one pass (columns of a (1001, 4) array)
+    densities = [density1, density2, density3, density4]
+    abs_err = np.multiply.outer(rel_err, densities)
     # merge into one dataframe
-    error = pd.DataFrame(zip(h, rel_err, abs_err1, abs_err2, abs_err3, abs_err4), columns=['h', 'rel_err', 'abs_err_'+str(density1), 'abs_err_'+str(density2), 'abs_err_'+str(density3), 'abs_err_'+str(density4)])
-    error = error.set_index(error.h)
+    columns = {'h': h, 'rel_err': rel_err}
+    for i, density in enumerate(densities):
+        columns['abs_err_'+str(density)] = abs_err[:, i]
+    error = pd.DataFrame(columns, index=pd.Index(h, name='h'))
     return error
 
 
 def func_exp(x, a, b, c):
-    return a * np.exp(b * x) + c
+    y = np.exp(b * x)
+    y *= a
+    y += c
+    return y
 
 def func_exp2(x, a, b):
-    return a * np.exp(b * x)
+    y = np.exp(b * x)
+    y *= a
+    return y
 
 def func_exp3(x, std):
     return std/np.sqrt(x)
 
+# Q: analytic jacobians (partial derivatives w.r.t. the parameters) of the exponential functions for curve_fit
+def jac_exp(x, a, b, c):
+    x = np.asarray(x, dtype=float)
+    e = np.exp(b * x)
+    return np.stack([e, a * x * e, np.ones_like(e)], axis=1)
+
+def jac_exp2(x, a, b):
+    x = np.asarray(x, dtype=float)
+    e = np.exp(b * x)
+    return np.stack([e, a * x * e], axis=1)
+
+def jac_exp3(x, std):
+    return (1.0 / np.sqrt(np.asarray(x, dtype=float)))[:, None]
+
 def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c', y_0=1, guess=(100, 1, -100), unit='kg/m2'):
     """
     :param x_data: array of x-data
     :param y_data: array of y-data
     """
+    # Q: hand plain float64 arrays to curve_fit, so the model functions run on numpy instead of pandas objects
+    x_fit = np.asarray(x_data, dtype=float)
+    y_fit = np.asarray(y_data, dtype=float)
     if function == 'a * exp(b * x) + c':
-        sigma = np.ones(len(x_data))
+        sigma = None  # unit weights
         if y_0 == 0:
+            sigma = np.ones(len(x_fit))
             sigma[0] = 0.000001  # fit is going through first point
-        popt, pcov = curve_fit(func_exp, x_data, y_data, p0=guess, sigma=sigma)
+        popt, pcov = curve_fit(func_exp, x_fit, y_fit, p0=guess, jac=jac_exp, sigma=sigma)
+        # standard deviation of the optimized parameters
+        perr = np.sqrt(np.diag(pcov))
         # y-values of fit
-        fit, popt = func_exp(x_data, *popt), popt
+        fit, popt = func_exp(x_fit, *popt), popt
         # create a 3D array with array[0]=x-values, array[1]=y-values of fit, array[2]=function params
         exp_x_fit_params = [x_data, fit, popt]
 
@@ -2284,11 +2665,11 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
         print('Exponential Regression -  %s' % title)
         print('optimized parameters of function = a * exp(b * x) + c' % popt)
         print('a       = %s' % popt[0])
-        print('sigma a = %s' % np.sqrt(np.diag(pcov))[0])
+        print('sigma a = %s' % perr[0])
         print('b       = %s' % popt[1])
-        print('sigma b = %s' % np.sqrt(np.diag(pcov))[1])
+        print('sigma b = %s' % perr[1])
         print('c       = %s' % popt[2])
-        print('sigma c = %s' % np.sqrt(np.diag(pcov))[2])
+        print('sigma c = %s' % perr[2])
         print('=========================================')
 
         # calculate R², variance (MSE), and standard deviation (RMSE) between y_data and fit
@@ -2296,9 +2677,11 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
 
         return exp_x_fit_params
     elif function == 'a * exp(b * x)':
-        popt, pcov = curve_fit(func_exp2, x_data, y_data, p0=guess)
+        popt, pcov = curve_fit(func_exp2, x_fit, y_fit, p0=guess, jac=jac_exp2)
+        # standard deviation of the optimized parameters
+        perr = np.sqrt(np.diag(pcov))
         # y-values of fit
-        fit, popt = func_exp2(x_data, *popt), popt
+        fit, popt = func_exp2(x_fit, *popt), popt
         # create a 3D array with array[0]=x-values, array[1]=y-values of fit, array[2]=function params
         exp_x_fit_params = [x_data, fit, popt]
 
@@ -2306,9 +2689,9 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
         print('Exponential Regression -  %s' % title)
         print('optimized parameters of function = a * exp(b * x)' % popt)
         print('a       = %s' % popt[0])
-        print('sigma a = %s' % np.sqrt(np.diag(pcov))[0])
+        print('sigma a = %s' % perr[0])
         print('b       = %s' % popt[1])
-        print('sigma b = %s' % np.sqrt(np.diag(pcov))[1])
+        print('sigma b = %s' % perr[1])
         print('=========================================')
 
         # calculate R², variance (MSE), and standard deviation (RMSE) between y_data and fit
@@ -2316,9 +2699,13 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
 
         return exp_x_fit_params
     elif function == 'std/sqrt(n)':
-        popt, pcov = curve_fit(func_exp3, x_data, y_data, p0=guess)
+        # Q: 1/sqrt(n) depends only on x_data, so evaluate it once for the model and its jacobian
+        inv_sqrt = 1.0 / np.sqrt(x_fit)
+        popt, pcov = curve_fit(lambda x, std: std * inv_sqrt, x_fit, y_fit, p0=guess, jac=lambda x, std: inv_sqrt[:, None])
+        # standard deviation of the optimized parameters
+        perr = np.sqrt(np.diag(pcov))
         # y-values of fit
-        fit, popt = func_exp3(x_data, *popt), popt
+        fit, popt = popt[0] * inv_sqrt, popt
         # create a 3D array with array[0]=x-values, array[1]=y-values of fit, array[2]=function params
         exp_x_fit_params = [x_data, fit, popt]
 
@@ -2326,7 +2713,7 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
         print('Exponential Regression -  %s' % title)
         print('optimized parameters of function std(n) = std1 / sqrt(n)' % popt)
         print('std1       = %s' % popt[0])
-        print('sigma std1 = %s' % np.sqrt(np.diag(pcov))[0])
+        print('sigma std1 = %s' % perr[0])
         print('=========================================')
 
         # calculate R², variance (MSE), and standard deviation (RMSE) between y_data and fit
@@ -2340,6 +2727,19 @@ def exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c',
         return exp_x_fit_params
 
 
+def exponential_regression_batch(titles, x_list, y_list, y_0=1, guess=(100, 1, -100), unit='kg/m2'):
+    """
+    fit 'a * exp(b * x) + c' to several data series, each series is fitted on its own with exponential_regression
+    (own stopping criteria, curve_fit raises a RuntimeError if a fit does not converge)
+    :param titles: list of titles, one per data series
+    :param x_list: list of arrays of x-data
+    :param y_list: list of arrays of y-data
+    :return: list of 3D arrays with array[0]=x-values, array[1]=y-values of fit, array[2]=function params, one per data series
+    """
+    return [exponential_regression(title, x_data, y_data, function='a * exp(b * x) + c', y_0=y_0, guess=guess, unit=unit)
+            for title, x_data, y_data in zip(titles, x_list, y_list)]
+
+
 
 
 """ Define plot functions """
@@ -2363,7 +2763,7 @@ def plot_ds(data_path, plot_name, create_plot=True, save=[False, True],
             y_axis2 = False, y2_label='snow height [cm]', legend2_position=(0.8, 0.2), legend2_title=None, y2_lim=None, y2tick_interval=100,
             y_axis3 = False, y3_label='density [kg/m³]', legend3_position=(0.8, 0.88), legend3_title=None, y3_lim=None, y3tick_interval=50,
             axes_labelsize=20, xtick_labelsize=18, ytick_labelsize=18,
-            legend_fontsize=18, lines_linewidth=1.7, bar_width=0.8):
+            legend_fontsize=18, lines_linewidth=1.7, bar_width=0.8, save_formats=('png',)):
     """
     Plot data (time) series (ds) with deviation / error bars
     :param ds:      data series in form of a float containing x-values (Datetime) as index and
@@ -2375,6 +2775,7 @@ def plot_ds(data_path, plot_name, create_plot=True, save=[False, True],
     :param save:    if True plot will be saved in processing_directory/30_plots folder
                     is False plot will be shown
     :param base_abb: Abbreviation of shown GNSS-base data (LB or JB) (if only one is selected, data will be saved in a separate folder)
+    :param save_formats: file formats the plot is saved in, e.g. ('png', 'pdf'), each format renders the figure again
     """
 
     plt.close()
@@ -2382,372 +2783,168 @@ def plot_ds(data_path, plot_name, create_plot=True, save=[False, True],
     if create_plot == True:
         print('\nPlotting figure: %s' % plot_name)
 
-        # Q: set plot parameters
-        plt.rcParams['axes.labelsize'] = axes_labelsize
-        plt.rcParams['xtick.labelsize'] = xtick_labelsize
-        plt.rcParams['ytick.labelsize'] = ytick_labelsize
-        plt.rcParams['legend.fontsize'] = legend_fontsize
-        plt.rcParams['legend.frameon'] = False
-        plt.rcParams['lines.linewidth'] = lines_linewidth
-
-        # Q: create figure
-        fig, ax1 = plt.subplots(figsize=fig_size, constrained_layout=True)
-        if y_axis2 == True:
-            ax2 = ax1.twinx()
-        if y_axis3 == True:
-            ax3 = ax1.twinx()
-
-        # Q: create dictionaries to grap parameters
-        dict_ds = {1: ds1, 2: ds2, 3: ds3, 4: ds4, 5: ds5, 6: ds6, 7: ds7, 8: ds8, 9: ds9}
-        dict_std = {1: ds1_std, 2: ds2_std, 3: ds3_std, 4: ds4_std, 5: ds5_std, 6: ds6_std, 7: ds7_std, 8: ds8_std, 9: ds9_std}
-        dict_std_label = {1: ds1_std_label, 2: ds2_std_label, 3: ds3_std_label, 4: ds4_std_label, 5: ds5_std_label, 6: ds6_std_label, 7: ds7_std_label, 8: ds8_std_label, 9: ds9_std_label}
-        dict_err = {1: ds1_err, 2: ds2_err, 3: ds3_err, 4: ds4_err, 5: ds5_err, 6: ds6_err, 7: ds7_err, 8: ds8_err, 9: ds9_err}
-        dict_label = {1: ds1_label, 2: ds2_label, 3: ds3_label, 4: ds4_label, 5: ds5_label, 6: ds6_label, 7: ds7_label, 8: ds8_label, 9: ds9_label}
-        dict_linestyle = {1: ds1_linestyle, 2: ds2_linestyle, 3: ds3_linestyle, 4: ds4_linestyle, 5: ds5_linestyle, 6: ds6_linestyle, 7: ds7_linestyle, 8: ds8_linestyle, 9: ds9_linestyle}
-        dict_marker = {1: ds1_marker, 2: ds2_marker, 3: ds3_marker, 4: ds4_marker, 5: ds5_marker, 6: ds6_marker, 7: ds7_marker, 8: ds8_marker, 9: ds9_marker}
-        dict_markersize = {1: ds1_markersize, 2: ds2_markersize, 3: ds3_markersize, 4: ds4_markersize, 5: ds5_markersize, 6: ds6_markersize, 7: ds7_markersize, 8: ds8_markersize, 9: ds9_markersize}
-        dict_color = {1: ds1_color, 2: ds2_color, 3: ds3_color, 4: ds4_color, 5: ds5_color, 6: ds6_color, 7: ds7_color, 8: ds8_color, 9: ds9_color}
-        dict_transparency = {1: ds1_transparency, 2: ds2_transparency, 3: ds3_transparency, 4: ds4_transparency, 5: ds5_transparency, 6: ds6_transparency, 7: ds7_transparency, 8: ds8_transparency, 9: ds9_transparency}
-        dict_yaxis = {1: ds1_yaxis, 2: ds2_yaxis, 3: ds3_yaxis, 4: ds4_yaxis, 5: ds5_yaxis, 6: ds6_yaxis, 7: ds7_yaxis, 8: ds8_yaxis, 9: ds9_yaxis}
-        dict_fit = {1: ds1_fit, 2: ds2_fit, 3: ds3_fit, 4: ds4_fit, 5: ds5_fit, 6: ds6_fit, 7: ds7_fit, 8: ds8_fit, 9: ds9_fit}
-        dict_fit_label = {1: ds1_fit_label, 2: ds2_fit_label, 3: ds3_fit_label, 4: ds4_fit_label, 5: ds5_fit_label, 6: ds6_fit_label, 7: ds7_fit_label, 8: ds8_fit_label, 9: ds9_fit_label}
-        dict_fit_linestyle = {1: ds1_fit_linestyle, 2: ds2_fit_linestyle, 3: ds3_fit_linestyle, 4: ds4_fit_linestyle, 5: ds5_fit_linestyle, 6: ds6_fit_linestyle, 7: ds7_fit_linestyle, 8: ds8_fit_linestyle, 9: ds9_fit_linestyle}
-        dict_bar = {1: ds1_bar, 2: ds2_bar, 3: ds3_bar, 4: ds4_bar, 5: ds5_bar, 6: ds6_bar, 7: ds7_bar, 8: ds8_bar, 9: ds9_bar}
-        dict_bias = {1: ds1_bias, 2: ds2_bias, 3: ds3_bias, 4: ds4_bias, 5: ds5_bias, 6: ds6_bias, 7: ds7_bias, 8: ds8_bias, 9: ds9_bias}
-
-        # Q: plotting all handed data
-        for i in range(1, 9 + 1):
-            if switch_xy == False:
-                # Q: plot data series (ds)
-                if dict_yaxis[i] == 1:
-                    if dict_ds[i] is not None:
-                        ax1.plot(dict_ds[i].index, dict_ds[i],
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax1.fill_between(dict_ds[i].index, dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax1.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax1.errorbar(dict_err[i].index, dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    if dict_bar[i] is not None:
-                        ax1.bar(dict_bar[i].index, dict_bar[i],
-                                 width=bar_width,
-                                 label=dict_label[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: fit/ regression curve
-                    if dict_fit[i] is not None:
-                        ax1.plot(dict_fit[i][0], dict_fit[i][1],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-                if dict_yaxis[i] == 2:
-                    if dict_ds[i] is not None:
-                        ax2.plot(dict_ds[i].index, dict_ds[i],
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax2.fill_between(dict_ds[i].index, dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax1.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax2.errorbar(dict_err[i].index, dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    if dict_bar[i] is not None:
-                        ax2.bar(dict_bar[i].index, dict_bar[i],
-                                 width=bar_width,
-                                 label=dict_label[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: Plot exponential regression curve
-                    if dict_fit[i] is not None:
-                        ax2.plot(dict_fit[i][0], dict_fit[i][1],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-                if dict_yaxis[i] == 3:
-                    if dict_ds[i] is not None:
-                        ax3.plot(dict_ds[i].index, dict_ds[i],
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax3.fill_between(dict_ds[i].index, dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax3.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax3.errorbar(dict_err[i].index, dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    if dict_bar[i] is not None:
-                        ax3.bar(dict_bar[i].index, dict_bar[i],
-                                 width=bar_width,
-                                 label=dict_label[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: Plot exponential regression curve
-                    if dict_fit[i] is not None:
-                        ax3.plot(dict_fit[i][0], dict_fit[i][1],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-            if switch_xy == True:
-                # Q: plot data series (ds)
-                if dict_yaxis[i] == 1:
-                    if dict_ds[i] is not None:
-                        ax1.plot(dict_ds[i], dict_ds[i].index,
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax1.fill_between(dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i], dict_ds[i].index,
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax1.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax1.errorbar(dict_err[i], dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    # Q: Plot exponential regression curve
-                    if dict_fit[i] is not None:
-                        ax1.plot(dict_fit[i][1], dict_fit[i][0],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-                if dict_yaxis[i] == 2:
-                    if dict_ds[i] is not None:
-                        ax2.plot(dict_ds[i], dict_ds[i].index,
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax2.fill_between(dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i], dict_ds[i].index,
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax1.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax2.errorbar(dict_err[i], dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    # Q: Plot exponential regression curve
-                    if dict_fit[i] is not None:
-                        ax2.plot(dict_fit[i][1], dict_fit[i][0],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-                if dict_yaxis[i] == 3:
-                    if dict_ds[i] is not None:
-                        ax3.plot(dict_ds[i].index, dict_ds[i],
-                                 label=dict_label[i],
-                                 linestyle=dict_linestyle[i],
-                                 marker=dict_marker[i],
-                                 markersize=dict_markersize[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: plot standard deviation of data series (_std)
-                    if dict_std[i] is not None:
-                        ax3.fill_between(dict_ds[i].index, dict_ds[i] - dict_std[i], dict_ds[i] + dict_std[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: plot bias of data series (_bias)
-                    if dict_bias[i] is not None:
-                        ax3.fill_between(dict_ds[i].index, dict_ds[i], dict_ds[i] + dict_bias[i],
-                                         color=dict_color[i],
-                                         alpha=0.2,
-                                         label=dict_std_label[i])
-                    # Q: Plot error bars
-                    if dict_err[i] is not None:
-                        ax3.errorbar(dict_err[i].index, dict_ds[i],
-                                     yerr=dict_err[i],
-                                     color='k',
-                                     linestyle='',
-                                     capsize=4,
-                                     alpha=0.5)
-                    if dict_bar[i] is not None:
-                        ax3.bar(dict_bar[i].index, dict_bar[i],
-                                 width=bar_width,
-                                 label=dict_label[i],
-                                 color=dict_color[i],
-                                 alpha=1-dict_transparency[i])
-                    # Q: Plot exponential regression curve
-                    if dict_fit[i] is not None:
-                        ax3.plot(dict_fit[i][0], dict_fit[i][1],
-                                 linestyle=dict_fit_linestyle[i],
-                                 color=dict_color[i],
-                                 label=dict_fit_label[i])
-
-
-        # Q: figure annotations
-        fig.suptitle(fig_title, y=0.93, fontsize=title_size)
-        leg = ax1.legend(title=legend_title, loc='upper left', bbox_to_anchor=legend_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
-        for line in leg.get_lines():
-            line.set_linewidth(2.5)
-            line.set_markersize(8)
-
-        # Q: axis settings
-        ax1.set_xlabel(x_label)
-        ax1.grid(color='lightgrey', linestyle='-', linewidth=1, alpha=0.5)
-        # Q: x-axis
-        ax1.set_xlim(x_lim)
-        if x_datetime == True:
-            start, end = ax1.get_xlim()
-            ax1.xaxis.set_ticks(np.arange(start, end, x_stepsize))
-            if x_locator == 'day':
-                ax1.xaxis.set_major_locator(DayLocator(interval=major_day_locator))
-                ax1.xaxis.set_minor_locator(AutoMinorLocator(x_stepsize))
+        # Q: set plot parameters for this figure only
+        with plt.rc_context({'axes.labelsize': axes_labelsize,
+                             'xtick.labelsize': xtick_labelsize,
+                             'ytick.labelsize': ytick_labelsize,
+                             'legend.fontsize': legend_fontsize,
+                             'legend.frameon': False,
+                             'lines.linewidth': lines_linewidth}):
+            # Q: create figure
+            fig, ax1 = plt.subplots(figsize=fig_size, constrained_layout=True)
+            if y_axis2 == True:
+                ax2 = ax1.twinx()
+            if y_axis3 == True:
+                ax3 = ax1.twinx()
+
+            # Q: collect the parameters of each data series in one record
+            series = [PlotSeries(ds1, ds1_bar, ds1_std, ds1_bias, ds1_err, ds1_fit, ds1_yaxis, ds1_linestyle, ds1_fit_linestyle, ds1_transparency, ds1_marker, ds1_markersize, ds1_color, ds1_label, ds1_std_label, ds1_fit_label),
+                      PlotSeries(ds2, ds2_bar, ds2_std, ds2_bias, ds2_err, ds2_fit, ds2_yaxis, ds2_linestyle, ds2_fit_linestyle, ds2_transparency, ds2_marker, ds2_markersize, ds2_color, ds2_label, ds2_std_label, ds2_fit_label),
+                      PlotSeries(ds3, ds3_bar, ds3_std, ds3_bias, ds3_err, ds3_fit, ds3_yaxis, ds3_linestyle, ds3_fit_linestyle, ds3_transparency, ds3_marker, ds3_markersize, ds3_color, ds3_label, ds3_std_label, ds3_fit_label),
+                      PlotSeries(ds4, ds4_bar, ds4_std, ds4_bias, ds4_err, ds4_fit, ds4_yaxis, ds4_linestyle, ds4_fit_linestyle, ds4_transparency, ds4_marker, ds4_markersize, ds4_color, ds4_label, ds4_std_label, ds4_fit_label),
+                      PlotSeries(ds5, ds5_bar, ds5_std, ds5_bias, ds5_err, ds5_fit, ds5_yaxis, ds5_linestyle, ds5_fit_linestyle, ds5_transparency, ds5_marker, ds5_markersize, ds5_color, ds5_label, ds5_std_label, ds5_fit_label),
+                      PlotSeries(ds6, ds6_bar, ds6_std, ds6_bias, ds6_err, ds6_fit, ds6_yaxis, ds6_linestyle, ds6_fit_linestyle, ds6_transparency, ds6_marker, ds6_markersize, ds6_color, ds6_label, ds6_std_label, ds6_fit_label),
+                      PlotSeries(ds7, ds7_bar, ds7_std, ds7_bias, ds7_err, ds7_fit, ds7_yaxis, ds7_linestyle, ds7_fit_linestyle, ds7_transparency, ds7_marker, ds7_markersize, ds7_color, ds7_label, ds7_std_label, ds7_fit_label),
+                      PlotSeries(ds8, ds8_bar, ds8_std, ds8_bias, ds8_err, ds8_fit, ds8_yaxis, ds8_linestyle, ds8_fit_linestyle, ds8_transparency, ds8_marker, ds8_markersize, ds8_color, ds8_label, ds8_std_label, ds8_fit_label),
+                      PlotSeries(ds9, ds9_bar, ds9_std, ds9_bias, ds9_err, ds9_fit, ds9_yaxis, ds9_linestyle, ds9_fit_linestyle, ds9_transparency, ds9_marker, ds9_markersize, ds9_color, ds9_label, ds9_std_label, ds9_fit_label)]
+            # Q: resolve the target axis once (index = yaxis - 1) and drop series without data, bars or fit
+            axes = (ax1, ax2 if y_axis2 == True else None, ax3 if y_axis3 == True else None)
+            series = [s for s in series if (s.ds is not None or s.bar is not None or s.fit is not None) and axes[s.yaxis - 1] is not None]
+
+            # Q: with switch_xy the data values go on the x-axis and the index on the y-axis
+            def xy(x, y):
+                return (y, x) if switch_xy == True else (x, y)
+
+            # Q: plotting all handed data, each series on the y-axis it is assigned to
+            for s in series:
+                ax = axes[s.yaxis - 1]
+                fill = ax.fill_betweenx if switch_xy == True else ax.fill_between
+                bar = ax.barh if switch_xy == True else ax.bar
+                # Q: plot data series (ds), handed to matplotlib as numpy arrays (datetime64/float) converted once per series
+                if s.ds is not None:
+                    ds_x, ds_y = s.ds.index.to_numpy(), s.ds.to_numpy()
+                    ax.plot(*xy(ds_x, ds_y),
+                            label=s.label,
+                            linestyle=s.linestyle,
+                            marker=s.marker,
+                            markersize=s.markersize,
+                            color=s.color,
+                            alpha=1-s.transparency)
+                # Q: plot standard deviation of data series (_std)
+                if s.std is not None:
+                    fill(ds_x, (s.ds - s.std).to_numpy(), (s.ds + s.std).to_numpy(),
+                         color=s.color,
+                         alpha=0.2,
+                         label=s.std_label)
+                # Q: plot bias of data series (_bias)
+                if s.bias is not None:
+                    fill(ds_x, ds_y, (s.ds + s.bias).to_numpy(),
+                         color=s.color,
+                         alpha=0.2,
+                         label=s.std_label)
+                # Q: Plot error bars
+                if s.err is not None:
+                    err = s.err.to_numpy()
+                    ax.errorbar(*xy(s.err.index.to_numpy(), ds_y),
+                                xerr=err if switch_xy == True else None,
+                                yerr=None if switch_xy == True else err,
+                                color='k',
+                                linestyle='',
+                                capsize=4,
+                                alpha=0.5)
+                # Q: plot bars (third positional argument is the bar thickness for bar and barh)
+                if s.bar is not None:
+                    bar(s.bar.index.to_numpy(), s.bar.to_numpy(), bar_width,
+                        label=s.label,
+                        color=s.color,
+                        alpha=1-s.transparency)
+                # Q: fit/ regression curve
+                if s.fit is not None:
+                    ax.plot(*xy(s.fit[0], s.fit[1]),
+                            linestyle=s.fit_linestyle,
+                            color=s.color,
+                            label=s.fit_label)
+
+
+            # Q: figure annotations
+            fig.suptitle(fig_title, y=0.93, fontsize=title_size)
+            leg = ax1.legend(title=legend_title, loc='upper left', bbox_to_anchor=legend_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
+            plt.setp(leg.get_lines(), linewidth=2.5, markersize=8)
+
+            # Q: axis settings
+            ax1.set_xlabel(x_label)
+            ax1.grid(color='lightgrey', linestyle='-', linewidth=1, alpha=0.5)
+            # Q: x-axis
+            ax1.set_xlim(x_lim)
+            if x_datetime == True:
+                if x_locator == 'day':
+                    ax1.xaxis.set_major_locator(DayLocator(interval=major_day_locator))
+                    ax1.xaxis.set_minor_locator(AutoMinorLocator(x_stepsize))
+                else:
+                    ax1.xaxis.set_major_locator(MonthLocator())
+                    ax1.xaxis.set_minor_locator(MonthLocator(bymonthday=15))
             else:
-                ax1.xaxis.set_major_locator(MonthLocator())
-                ax1.xaxis.set_minor_locator(MonthLocator(bymonthday=15))
-        else:
-            ax1.xaxis.set_major_locator(MultipleLocator(xtick_interval))
-            ax1.xaxis.set_minor_locator(AutoMinorLocator(2))
-        if y_axis2 is False:
-            plt.xticks(rotation=xtick_rotation)
-        if plot_date_lines is True:
-            plt.axvline(dt.datetime(2021, 11, 16), color='red')
-            plt.axvline(dt.datetime(2021, 11, 27), color='goldenrod')
-            plt.axvline(dt.datetime(2021, 12, 21), color='dodgerblue')
-        if plot_vline is not None:
-            plt.axvline(plot_vline, color='grey')
-        if hline_value is not None:
-            ax1.axhline(y=hline_value, color='grey', label=hline_label)
-        if ax2_hline_value is not None:
-            ax2.axhline(y=ax2_hline_value, color='grey', label=hline_label)
-
-        # Q: y-axis
-        ax1.set_ylabel(y_label)
-        ax1.set_ylim(y_lim)
-        ax1.yaxis.set_major_locator(MultipleLocator(ytick_interval))
-        ax1.yaxis.set_minor_locator(AutoMinorLocator(2))
-        if invert_y1axis == True:
-            ax1.invert_yaxis()
-            ax1.xaxis.tick_top()
-            ax1.xaxis.set_label_position('top')
-
-        if y_axis2 == True:
-            ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
-            ax2.set_ylabel(y2_label)
-            ax2.set_ylim(y2_lim)
-            ax2.yaxis.set_major_locator(MultipleLocator(y2tick_interval))
-            ax2.yaxis.set_minor_locator(AutoMinorLocator(2))
-            leg2 = ax2.legend(title=legend2_title, loc='upper left', bbox_to_anchor=legend2_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
-            for line in leg2.get_lines():
-                line.set_linewidth(2.5)
-                line.set_markersize(8)
-
-        if y_axis3 == True:
-            ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
-            ax3.set_ylabel(y3_label)
-            ax3.set_ylim(y3_lim)
-            ax3.yaxis.set_major_locator(MultipleLocator(y3tick_interval))
-            ax3.yaxis.set_minor_locator(AutoMinorLocator(2))
-            leg3 = ax3.legend(title=legend3_title, loc='upper left', bbox_to_anchor=legend3_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
-            rspine = ax3.spines['right']
-            rspine.set_position(('axes', 1.1))
-            for line in leg3.get_lines():
-                line.set_linewidth(2.5)
-                line.set_markersize(8)
-
-        # Q: Options: Save figure
-        if save is True and base_abb is not None:
-            plt.savefig(data_path + '/30_plots/' + base_abb + plot_name + suffix + '.png')
-            plt.savefig(data_path + '/30_plots/' + base_abb + plot_name + suffix + '.pdf')
-            print('plot saved at %s/30_plots/%s' % (data_path, base_abb))
-        elif save is True and base_abb is None:
-            plt.savefig(data_path + '/30_plots/' + plot_name + suffix + '.png')
-            plt.savefig(data_path + '/30_plots/' + plot_name + suffix + '.pdf')
-            print('plot saved at %s/30_plots/' % data_path)
-        else:
-            plt.show(bbox_inches='tight')
+                ax1.xaxis.set_major_locator(MultipleLocator(xtick_interval))
+                ax1.xaxis.set_minor_locator(AutoMinorLocator(2))
+            if y_axis2 is False:
+                plt.xticks(rotation=xtick_rotation)
+            if plot_date_lines is True:
+                plt.axvline(dt.datetime(2021, 11, 16), color='red')
+                plt.axvline(dt.datetime(2021, 11, 27), color='goldenrod')
+                plt.axvline(dt.datetime(2021, 12, 21), color='dodgerblue')
+            if plot_vline is not None:
+                plt.axvline(plot_vline, color='grey')
+            if hline_value is not None:
+                ax1.axhline(y=hline_value, color='grey', label=hline_label)
+            if ax2_hline_value is not None:
+                ax2.axhline(y=ax2_hline_value, color='grey', label=hline_label)
+
+            # Q: y-axis
+            ax1.set_ylabel(y_label)
+            ax1.set_ylim(y_lim)
+            ax1.yaxis.set_major_locator(MultipleLocator(ytick_interval))
+            ax1.yaxis.set_minor_locator(AutoMinorLocator(2))
+            if invert_y1axis == True:
+                ax1.invert_yaxis()
+                ax1.xaxis.tick_top()
+                ax1.xaxis.set_label_position('top')
+
+            if y_axis2 == True:
+                ax1.tick_params(axis='x', labelrotation=45)
+                ax2.set_ylabel(y2_label)
+                ax2.set_ylim(y2_lim)
+                ax2.yaxis.set_major_locator(MultipleLocator(y2tick_interval))
+                ax2.yaxis.set_minor_locator(AutoMinorLocator(2))
+                leg2 = ax2.legend(title=legend2_title, loc='upper left', bbox_to_anchor=legend2_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
+                plt.setp(leg2.get_lines(), linewidth=2.5, markersize=8)
+
+            if y_axis3 == True:
+                ax1.tick_params(axis='x', labelrotation=45)
+                ax3.set_ylabel(y3_label)
+                ax3.set_ylim(y3_lim)
+                ax3.yaxis.set_major_locator(MultipleLocator(y3tick_interval))
+                ax3.yaxis.set_minor_locator(AutoMinorLocator(2))
+                leg3 = ax3.legend(title=legend3_title, loc='upper left', bbox_to_anchor=legend3_position, fontsize=legend_fontsize, title_fontsize=legend_fontsize)
+                rspine = ax3.spines['right']
+                rspine.set_position(('axes', 1.1))
+                plt.setp(leg3.get_lines(), linewidth=2.5, markersize=8)
+
+            # Q: Options: Save figure
+            if save is True and base_abb is not None:
+                for fmt in save_formats:
+                    plt.savefig(data_path + '/30_plots/' + base_abb + plot_name + suffix + '.' + fmt)
+                print('plot saved at %s/30_plots/%s' % (data_path, base_abb))
+            elif save is True and base_abb is None:
+                for fmt in save_formats:
+                    plt.savefig(data_path + '/30_plots/' + plot_name + suffix + '.' + fmt)
+                print('plot saved at %s/30_plots/' % data_path)
+            else:
+                plt.show(bbox_inches='tight')
 
 
-def plot_swediff_boxplot(dest_path, diffs, y_lim=(-200, 600), save=[False, True], base_abb=['LB', 'JB']):
+def plot_swediff_boxplot(dest_path, diffs, y_lim=(-200, 600), save=[False, True], base_abb=['LB', 'JB'], save_formats=('png',)):
     """ Plot boxplot of differences of SWE from manual/laser/emlid data to Leica data
+    :param save_formats: file formats the plot is saved in, e.g. ('png', 'pdf')
     """
     plt.close()
     diffs.dswe_manual.describe()
@@ -2757,32 +2954,38 @@ def plot_swediff_boxplot(dest_path, diffs, y_lim=(-200, 600), save=[False, True]
     plt.grid()
     plt.ylabel('ΔSWE (mm w.e.)', fontsize=12)
     if save is True:
-        plt.savefig(dest_path + '30_plots/' + base_abb + '/box_diffSWE.png', bbox_inches='tight')
-        plt.savefig(dest_path + '30_plots/' + base_abb + '/box_diffSWE.pdf', bbox_inches='tight')
+        # Q: lay out once instead of the extra tight-bbox render pass per saved file
+        plt.tight_layout()
+        for fmt in save_formats:
+            plt.savefig(dest_path + '30_plots/' + base_abb + '/box_diffSWE.' + fmt)
     else:
         plt.show()
 
 
+def count_amb_states(amb_state):
+    """ count fixed (1) and float (2) ambiguity solutions per day in one resampling pass
+    :param amb_state: time series of ambiguity states (1=fix, 2=float, 5=standalone)
+    :return: dataframe with daily number of 'Fixed', 'Float' and 'Total' solutions
+    """
+    nr_amb = pd.DataFrame({'Fixed': amb_state.eq(1), 'Float': amb_state.eq(2)}).resample('D').sum().astype(int)
+    nr_amb['Total'] = nr_amb['Fixed'] + nr_amb['Float']
+    return nr_amb
+
+
 def plot_solquality(data_path, amb_leica, amb_emlid, create_plot=[False, True], save=[False, True], suffix='', y_lim=(0, 100),
-                    x_lim=(dt.date(2021, 11, 26), dt.date(2022, 12, 1))):
+                    x_lim=(dt.date(2021, 11, 26), dt.date(2022, 12, 1)), save_formats=('png',)):
     """
     Plot quality of ambiguity resolution (1=fix, 2=float, 5=standalone) for high-end and low-cost rovers
+    :param save_formats: file formats the plot is saved in, e.g. ('png', 'pdf')
     """
     if create_plot is True:
         plt.close()
-        plt.figure()
 
         # calculate number of fixed and float ambiguity solutions per day
-        nr_float_leica = amb_leica[(amb_leica == 2)].resample('D').count()
-        nr_fixed_leica = amb_leica[(amb_leica == 1)].resample('D').count()
-        nr_total_leica = nr_fixed_leica + nr_float_leica
-        nr_amb_leica = pd.concat([nr_fixed_leica, nr_float_leica, nr_total_leica], axis=1).fillna(0).astype(int)
-        nr_amb_leica.columns = ['Fixed', 'Float', 'Total']
-        nr_float_emlid = amb_emlid[(amb_emlid == 2)].resample('D').count()
-        nr_fixed_emlid = amb_emlid[(amb_emlid == 1)].resample('D').count()
-        nr_total_emlid = nr_fixed_emlid + nr_float_emlid
-        nr_amb_emlid = pd.concat([nr_fixed_emlid, nr_float_emlid, nr_total_emlid], axis=1).fillna(0).astype(int)
-        nr_amb_emlid.columns = ['Fixed', 'Float', 'Total']
+        nr_amb_leica = count_amb_states(amb_leica)
+        nr_amb_emlid = count_amb_states(amb_emlid)
+        nr_fixed_leica = nr_amb_leica['Fixed']
+        nr_fixed_emlid = nr_amb_emlid['Fixed']
         # x day mean
         leica_fixed_mean = nr_fixed_leica.resample('5D').mean().interpolate()
         emlid_fixed_mean = nr_fixed_emlid.resample('5D').mean().interpolate()
@@ -2813,10 +3016,8 @@ def plot_solquality(data_path, amb_leica, amb_emlid, create_plot=[False, True],
         axes[1].yaxis.set_major_locator(MultipleLocator(10))
         axes[0].xaxis.set_major_locator(MonthLocator())
         axes[1].xaxis.set_major_locator(MonthLocator())
-        leg = axes[1].legend(loc='upper right')
-        for line in leg.get_lines():
-            line.set_linewidth(2.5)
-            line.set_markersize(8)
+        leg = axes[1].legend(loc='upper right', bbox_to_anchor=(1.0, 1.0))
+        plt.setp(leg.get_lines(), linewidth=2.5, markersize=8)
         axes[0].set_xlim(x_lim)
         axes[1].set_xlim(x_lim)
         axes[0].set_ylabel('High-end solution')
@@ -2824,12 +3025,11 @@ def plot_solquality(data_path, amb_leica, amb_emlid, create_plot=[False, True],
         axes[0].get_legend().remove()
 
         if save is True:
-            plt.savefig(
-                data_path + '/30_plots/0b_Ambstate_' + str(x_lim[0].year) + '_' + str(x_lim[1].year)[-2:] + suffix + '.png',
-                bbox_inches='tight')
-            plt.savefig(
-                data_path + '/30_plots/0b_Ambstate_' + str(x_lim[0].year) + '_' + str(x_lim[1].year)[-2:] + suffix + '.pdf',
-                bbox_inches='tight')
+            # Q: lay out once instead of the extra tight-bbox render pass per saved file
+            fig.tight_layout()
+            for fmt in save_formats:
+                plt.savefig(
+                    data_path + '/30_plots/0b_Ambstate_' + str(x_lim[0].year) + '_' + str(x_lim[1].year)[-2:] + suffix + '.' + fmt)
         else:
             plt.show()
     else:
@@ -2856,7 +3056,34 @@ def prepare_orbits(sp3_outdir, raporbit_path, gnssir_path):
     unzip_orbits(sp3_tempdir)
 
     # Q: rename orbit files (need to match the gnssrefl input name format!)
-    rename_orbits(sp3_tempdir, gnssir_path)
+    rename_orbits(sp3_tempdir, gnssir_path, sp3_outdir)
+
+
+def download_ftp_files(host, remote_files, local_dir, max_workers=8):
+    """ download files from an anonymous ftp server in parallel threads, each thread reuses its own ftp connection
+        :param host: ftp server, e.g. 'isdcftp.gfz-potsdam.de'
+        :param remote_files: list of file paths on the server
+        :param local_dir: local directory to store the files
+        :param max_workers: maximum number of parallel ftp connections
+    """
+    connections = threading.local()
+    open_connections = []
+
+    def download(remote_file):
+        if not hasattr(connections, 'ftp'):
+            connections.ftp = ftplib.FTP(host)
+            connections.ftp.login()
+            open_connections.append(connections.ftp)
+        with open(local_dir + os.path.basename(remote_file), 'wb') as f:
+            connections.ftp.retrbinary('RETR ' + remote_file, f.write)
+        print(os.path.basename(remote_file))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(download, remote_files))
+    finally:
+        for ftp in open_connections:
+            ftp.close()
 
 
 def get_orbits(sp3_outdir, raporbit_path):
@@ -2888,10 +3115,24 @@ def get_orbits(sp3_outdir, raporbit_path):
     # define ftp subdirectories to download newly available orbit files
     gpsweek_list = list(range(gpsweek_newest, gpsweek_today + 1, 1))
 
-    for gpswk in gpsweek_list:
-        download_path = raporbit_path + 'w' + str(gpswk) + '/'
-        # download all .SP3 rapid orbits from ftp server's subfolders
-        subprocess.call('wget -r -np -nc -nH --cut-dirs=4 -A .SP3.gz ' + download_path + ' -P ' + sp3_tempdir)
+    # list all .SP3 rapid orbits in the ftp server's subfolders over one connection, skip already downloaded files
+    url = urlparse(raporbit_path)
+    existing_files = set(os.listdir(sp3_outdir)) | set(os.listdir(sp3_tempdir))
+    remote_files = []
+    with ftplib.FTP(url.hostname) as ftp:
+        ftp.login()
+        for gpswk in gpsweek_list:
+            download_path = url.path + 'w' + str(gpswk) + '/'
+            try:
+                names = ftp.nlst(download_path)
+            except ftplib.error_perm:
+                print(colored("\nno orbit directory on ftp server: %s" % download_path, 'yellow'))
+                continue
+            remote_files += [download_path + os.path.basename(name) for name in names
+                             if name.endswith('.SP3.gz') and os.path.basename(name) not in existing_files]
+
+    # download the new orbit files in parallel
+    download_ftp_files(url.hostname, remote_files, sp3_tempdir)
 
     print(colored("\nGFZ rapid orbits downloaded to: %s" % sp3_outdir, 'blue'))
 
@@ -2900,14 +3141,23 @@ def get_orbits(sp3_outdir, raporbit_path):
 
 def unzip_orbits(sp3_tempdir):
     """ Unzip all orbit files in the temporary orbit processing directory
-        example from orbit file: 'GFZ0OPSRAP_20231190000_01D_05M_ORB.SP3.gz' to '_GFZ0OPSRAP_20231190000_01D_05M_ORB.SP3'
+        example from orbit file: 'GFZ0OPSRAP_20231190000_01D_05M_ORB.SP3.gz' to 'GFZ0OPSRAP_20231190000_01D_05M_ORB.SP3'
         :param sp3_tempdir: temporary orbit processing directory
         """
-    # unzip all files
-    subprocess.call(r'7z e -y ' + sp3_tempdir + ' -o' + sp3_tempdir)
+    # unzip all files in parallel threads (zlib releases the GIL while decompressing)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(gunzip_file, glob.glob(sp3_tempdir + '*.gz')))
     print(colored("\nGFZ rapid orbits unzipped", 'blue'))
 
 
+def gunzip_file(gz_file):
+    """ decompress a .gz file next to it (without the .gz extension), keeping the compressed file
+        :param gz_file: path of the .gz file
+    """
+    with gzip.open(gz_file, 'rb') as f_in, open(gz_file[:-3], 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out, length=1 << 20)
+
+
 def rename_orbits(sp3_tempdir, gnssir_path, sp3_outdir):
     """ Rename & move orbit files (need to match the gnssrefl input name format!)
         example from 'GFZ0OPSRAP_20231190000_01D_05M_ORB.SP3' to 'GFZ0MGXRAP_20231190000_01D_05M_ORB.SP3'
@@ -2915,34 +3165,37 @@ def rename_orbits(sp3_tempdir, gnssir_path, sp3_outdir):
         :param gnssir_path: output directory for gnssrefl input (yearly directories)
         :param sp3_outdir: temporary output directory to store & convert downloaded orbit files
     """
-    # rename & move extracted orbits to match the gfzrnx input format
-    for orbit_file in glob.glob(sp3_tempdir + '*.SP3'):
-        # define input and output filename
-        infile = os.path.basename(orbit_file)
-        outfile = infile[1:5] + 'MGX' + infile[8:]
-        print('\nrename orbit file from: ', infile, ' to: ', outfile)
-
-        # rename the file
-        os.rename(orbit_file, os.path.dirname(orbit_file) + '/' + outfile)
-
-        # define dest dir
-        year = outfile.split('_')[1][:4]
+    # list the temp dir once: group extracted orbits by year (renamed to match the gfzrnx input format), collect zipped originals
+    orbits_per_year = defaultdict(list)
+    gz_files = []
+    with os.scandir(sp3_tempdir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.SP3'):
+                # (7z extracted the files with a leading '_', gzip keeps the original name)
+                name = entry.name.lstrip('_')
+                outfile = name[:4] + 'MGX' + name[7:]
+                orbits_per_year[outfile.split('_')[1][:4]].append((entry.name, outfile))
+            elif entry.name.endswith('.gz'):
+                gz_files.append(entry.name)
+
+    # move files to the yearly data directory for gnssrefl if they do not already exist
+    for year, orbit_files in sorted(orbits_per_year.items()):
         dest_dir = gnssir_path + 'data/' + year + '/sp3/'
-
-        # move file to data directory for gnssrefl if it does not already exist
-        if not os.path.exists(dest_dir + outfile):
-            if not os.path.exists(dest_dir):
-                os.makedirs(dest_dir, exist_ok=True)
-            shutil.move(os.path.dirname(orbit_file) + '/' + outfile, dest_dir)
-            print("orbit file moved to yearly sp3 dir %s" % dest_dir)
-        else:
-            os.remove(os.path.dirname(orbit_file) + '/' + outfile)
-            print("file in destination already exists, move aborted, file removed")
-    print(colored("\nGFZ rapid orbits renamed and moved to yearly (e.g. 2021): %s" % dest_dir, 'blue'))
+        os.makedirs(dest_dir, exist_ok=True)
+        existing_files = set(os.listdir(dest_dir))
+        for infile, outfile in orbit_files:
+            print('\nrename orbit file from: ', infile, ' to: ', outfile)
+            if outfile not in existing_files:
+                os.replace(sp3_tempdir + infile, dest_dir + outfile)
+                print("orbit file moved to yearly sp3 dir %s" % dest_dir)
+            else:
+                os.remove(sp3_tempdir + infile)
+                print("file in destination already exists, move aborted, file removed")
+        print(colored("\nGFZ rapid orbits renamed and moved to yearly (e.g. 2021): %s" % dest_dir, 'blue'))
 
     # move zipped original orbit files (.gz) to parent dir
-    for f in glob.iglob(sp3_tempdir + '*.gz', recursive=True):
-        shutil.move(f, sp3_outdir)
+    for gz_file in gz_files:
+        os.replace(sp3_tempdir + gz_file, sp3_outdir + gz_file)
     print("original zipped orbit files (.gz) moved to parent dir %s" % sp3_outdir)
 
     # remove temporary preprocessing directory
@@ -2972,7 +3225,10 @@ def copy_obs(dest_path, rin_temp, base_name):
         :param dest_path: data destination path for python processing
         :param base_name: prefix of base rinex observation files, e.g. station name ('NMLB')
     """
-    for rinex_file in sorted(glob.glob(dest_path + '3387*0.*[olng]'), reverse=True):
+    # select base rinex obs [o] and nav [lng] files from one directory scan
+    with os.scandir(dest_path) as entries:
+        rinex_files = sorted((entry.name for entry in entries if fnmatch.fnmatch(entry.name, '3387*0.*[olng]')), reverse=True)
+    for rinex_file in rinex_files:
         # copy base rinex obs [o] and nav [lng] files
         copy_file_no_overwrite(dest_path, rin_temp, os.path.basename(rinex_file))
 
@@ -2996,26 +3252,32 @@ def conv_obs(rin_temp, gnssir_path, base_name):
         :return: year_start, year_end, doy_start, doy_end
     """
     doy = []
+    years = []
+    commands = []
     for rinex_file in sorted(glob.glob(rin_temp + '*o'), reverse=True):
         year = '20' + os.path.basename(rinex_file)[-3:-1]
         doy_new = os.path.basename(rinex_file).split('.')[0][-4:-1]
         doy.append(doy_new)
+        years.append(year)
         if not os.path.exists(
                 gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/' + os.path.basename(rinex_file)):
             print(rinex_file)
             if not os.path.exists(gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/'):
                 os.makedirs(gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/', exist_ok=True)
-            subprocess.call(
-                r'gfzrnx -finp ' + rinex_file + ' -vo 2 -smp 30 -fout ' + gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/::RX2::')
+            commands.append(['gfzrnx', '-finp', rinex_file, '-vo', '2', '-smp', '30', '-fout',
+                             gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/::RX2::'])
+
+    # convert all files in parallel gfzrnx processes
+    run_commands(commands, rin_temp)
 
     print(colored(
         "\nRinex3 files converted to rinex2 and moved to yearly (e.g. 2021): %s" % gnssir_path + 'data/rinex/' + base_name.lower() + '/' + year + '/',
         'blue'))
 
     # return start and end year, doy for GNSS-IR processing
-    year_start = year[-1]  # '2021'
+    year_start = years[-1]  # '2021'
     doy_start = doy[-1]  # '330'
-    year_end = year[0]
+    year_end = years[0]
     doy_end = doy[0]
 
     return year_start, year_end, doy_start, doy_end
@@ -3037,15 +3299,18 @@ def read_gnssir(dest_path, reflecto_sol_src_path, base_name, yy='21', copy=False
     # Q: copy GNSS-IR solution files (*.txt) from the local directory if not already existing
     if copy is True:
         print(colored("\ncopy new reflectometry solution files", 'blue'))
-        # get list of yearly directories
-        for f in glob.glob(reflecto_sol_src_path + '2*'):
-            year = os.path.basename(f)
-            if int(year) >= int('20' + yy):
+        # list the already copied files and the yearly directories once
+        existing_files = set(os.listdir(loc_gnssir_dir))
+        with os.scandir(reflecto_sol_src_path) as entries:
+            years = sorted(entry.name for entry in entries if entry.is_dir() and entry.name.startswith('2'))
+        for year in years:
+            sol_dir = reflecto_sol_src_path + year + '/results/' + base_name.lower() + '/rh2-8m_ele5-30/'
+            if int(year) >= int('20' + yy) and os.path.isdir(sol_dir):
                 # copy missing reflectometry solution files
-                for f in glob.glob(reflecto_sol_src_path + year + '/results/' + base_name.lower() + '/rh2-8m_ele5-30/*.txt'):
-                    file = os.path.basename(f)
+                for file in list_files(sol_dir, suffix='.txt'):
+                    f = sol_dir + file
                     # skip files of 2021 before 26th nov (no gps data before installation)
-                    if not os.path.exists(loc_gnssir_dir + file):
+                    if file not in existing_files:
                         # check if the name of the solution file begins with the year
                         if file[:4] == year:
                             print(file)
@@ -3069,10 +3334,10 @@ def read_gnssir(dest_path, reflecto_sol_src_path, base_name, yy='21', copy=False
     # Q: read all existing GNSS-IR observations from .pkl if already exists, else create empty dataframe
     loc_gnssir_dir = dest_path + '20_solutions/' + base_name + '/rh2-8m_ele5-30/'
     path_to_oldpickle = loc_gnssir_dir + pickle + '.pkl'
-    if os.path.exists(path_to_oldpickle):
+    df_rh = read_parquet(path_to_oldpickle)
+    if df_rh is not None:
         print(
-            colored('\nReading already existing reflectometry solutions from pickle: %s' % path_to_oldpickle, 'yellow'))
-        df_rh = pd.read_pickle(path_to_oldpickle)
+            colored('\nReading already existing reflectometry solutions from parquet (or legacy pickle): %s' % path_to_oldpickle, 'yellow'))
         old_idx = df_rh.index[-1].date().strftime("%Y%j")
         old_idx_year = int(old_idx[:4])
         old_idx_doy = int(old_idx[-3:])
@@ -3084,31 +3349,34 @@ def read_gnssir(dest_path, reflecto_sol_src_path, base_name, yy='21', copy=False
 
     # read all reflector height solution files in folder, parse mjd column to datetimeindex and add them to the dataframe
     print(colored('\nReading all new reflectometry solution files from: %s' % loc_gnssir_dir + '*.txt', 'blue'))
-    for file in glob.iglob(loc_gnssir_dir + '*.txt', recursive=True):
-        # read solution files newer than last entry in reflectometry solutions pickle, check year and doy
-        if ((int(os.path.basename(file)[:4]) >= old_idx_year) & (int(os.path.basename(file)[-7:-4]) > old_idx_doy)) \
-                or (int(os.path.basename(file)[:4]) > old_idx_year):
-            print(file)
-
-            # header: year, doy, RH (m), sat,UTCtime (hrs), Azim (deg), Amp (v/v), eminO (deg), emaxO (deg), NumbOf (values), freq,rise,EdotF (hrs), PkNoise, DelT (min), MJD, refr-appl (1=yes)
-            rh = pd.read_csv(file, header=4, delimiter=' ', skipinitialspace=True, na_values=["NaN"],
-                             names=['year', 'doy', 'RH', 'sat', 'UTCtime', 'Azim', 'Amp', 'eminO', 'emaxO', 'NumbOf',
-                                    'freq', 'rise', 'EdotF', 'PkNoise', 'DelT', 'MJD', 'refr-appl'], index_col=False)
-            df_rh = pd.concat([df_rh, rh], axis=0)
-        else:
-            pass
-
-    # convert year doy UTCtime to datetimeindex
-    df_rh.index = pd.DatetimeIndex(pd.to_datetime(df_rh.year * 1000 + df_rh.doy, format='%Y%j')
+    # collect the frames and concat them once after reading
+    rh_list = [df_rh]
+    # solution files (e.g. '2021_nmlb330.txt') newer than last entry in reflectometry solutions pickle, compare (year, doy) from the names of one directory scan
+    new_files = [loc_gnssir_dir + name for name in list_files(loc_gnssir_dir, suffix='.txt')
+                 if (int(name[:4]), int(name[-7:-4])) > (old_idx_year, old_idx_doy)]
+    for file in new_files:
+        print(file)
+
+        # header: year, doy, RH (m), sat,UTCtime (hrs), Azim (deg), Amp (v/v), eminO (deg), emaxO (deg), NumbOf (values), freq,rise,EdotF (hrs), PkNoise, DelT (min), MJD, refr-appl (1=yes)
+        rh = pd.read_csv(file, header=4, delimiter=' ', skipinitialspace=True, na_values=["NaN"],
+                         names=['year', 'doy', 'RH', 'sat', 'UTCtime', 'Azim', 'Amp', 'eminO', 'emaxO', 'NumbOf',
+                                'freq', 'rise', 'EdotF', 'PkNoise', 'DelT', 'MJD', 'refr-appl'], index_col=False,
+                         dtype=GNSSIR_DTYPES)
+        rh_list.append(rh)
+    df_rh = pd.concat(rh_list, axis=0).astype(GNSSIR_DTYPES)
+
+    # convert year doy UTCtime to datetimeindex (only the few distinct years are parsed (cache), doy and time are added as timedeltas)
+    df_rh.index = pd.DatetimeIndex(pd.to_datetime(df_rh.year.astype(str), format='%Y', cache=True)
+                                   + pd.to_timedelta(df_rh.doy.astype('int64') - 1, unit='D')
                                    + pd.to_timedelta(df_rh.UTCtime, unit='h')).floor('s')
 
     # detect all dublicates and only keep last dublicated entries
     df_rh = df_rh[~df_rh.index.duplicated(keep='last')]
 
-    # store dataframe as binary pickle format
-    df_rh.to_pickle(loc_gnssir_dir + pickle + '.pkl')
+    # store dataframe as compressed parquet file
+    path_parquet = write_parquet(df_rh, loc_gnssir_dir + pickle + '.pkl')
     print(colored(
-        '\nstored all old and new reflectometry solution data (without dublicates) in pickle: %s' + loc_gnssir_dir + pickle + '.pkl',
+        '\nstored all old and new reflectometry solution data (without dublicates) in parquet: %s' % path_parquet,
         'blue'))
 
     return df_rh
@@ -3124,65 +3392,62 @@ def filter_gnssir(df_rh, acc_at_time_of_first_obs=0, freq=[1, 5, 101, 102, 201,
         :return df_rh, gnssir_acc, gnssir_acc_sel
     """
 
-    # Q: select frequencies to analyze
+    # Q: excluding spuso e-m-wave bending and reflection zone azimuths
+    azim = df_rh['Azim'].to_numpy()
+    mask = (azim > 30) & (azim < 310) & ((azim > 210) | (azim < 160))
+
+    # Q: select frequencies to analyze (combined with the azimuth mask, so RH is only indexed once)
     if freq == 'all':  # select all frequencies from all systems
         print('all frequencies are selected')
-        gnssir_rh = df_rh[['RH', 'Azim']]
     elif freq == '2nd':  # select all second frequencies from GPS, GLONASS, GALILEO
         print('2nd frequencies are selected')
-        gnssir_rh = df_rh[['RH', 'Azim']][(df_rh.freq.isin([5, 102, 205, 207]))]
+        mask &= np.isin(df_rh['freq'].to_numpy(), [5, 102, 205, 207])
     elif freq == '1st':  # select all first frequencies from GPS, GLONASS, GALILEO
         print('1st frequencies are selected')
-        gnssir_rh = df_rh[['RH', 'Azim']][(df_rh.freq.isin([1, 101, 201]))]
+        mask &= np.isin(df_rh['freq'].to_numpy(), [1, 101, 201])
     else:  # select chosen single frequency
         print('single frequency is selected')
-        gnssir_rh = df_rh[['RH', 'Azim']][(df_rh.freq == freq)]
+        mask &= df_rh['freq'].to_numpy() == freq
 
-    # Q: excluding spuso e-m-wave bending and reflection zone azimuths and convert to mm
-    gnssir_rh = gnssir_rh[(gnssir_rh.Azim > 30) & (gnssir_rh.Azim < 310)]
-    gnssir_rh = gnssir_rh.RH[(gnssir_rh.Azim > 210) | (gnssir_rh.Azim < 160)] * 1000
+    # Q: convert to mm
+    gnssir_rh = df_rh['RH'][mask] * 1000
 
     # Q: adjust for snow mast heightening (approx. 3m elevated several times a year)
     print('\ndata is corrected for snow mast heightening events (remove sudden jumps > 1m)')
     # sort index
     gnssir_rh = gnssir_rh.sort_index()
 
-    # detect jump
-    jump = gnssir_rh[(gnssir_rh.diff() > 2500)]  # detect jumps (> 2500mm) in the dataset
-
-    # get value of jump difference (of values directly after - before jump)
-    jump_ind = jump.index.format()[0]
-    jump_val = gnssir_rh[jump_ind] - gnssir_rh[:jump_ind][-2]
+    # detect jumps (> 2500mm) between consecutive observations in one pass
+    vals = gnssir_rh.to_numpy(dtype=float)
+    diffs = np.zeros_like(vals)
+    np.subtract(vals[1:], vals[:-1], out=diffs[1:])
+    jumps = np.where(diffs > 2500, diffs, 0.0)
+    for jump_pos in np.flatnonzero(jumps):
+        print('\njump of height %s is detected! at %s' % (jumps[jump_pos], gnssir_rh.index[jump_pos]))
 
-    # detect and correct all jumps
-    while jump.empty is False:
-        print('\njump of height %s is detected! at %s' % (jump_val, jump.index.format()[0]))
-        adj = gnssir_rh[
-                  (gnssir_rh.index >= jump.index.format()[0])] - jump_val  # correct all observations after jump [0]
-        gnssir_rh = pd.concat([gnssir_rh[~(gnssir_rh.index >= jump.index.format()[0])],
-                               adj])  # concatenate all original obs before jump with adjusted values after jump
-        jump = gnssir_rh[(gnssir_rh.diff() > 2500)]
+    # correct all observations after each jump by the cumulated jump heights (index is sorted)
+    gnssir_rh = pd.Series(vals - np.cumsum(jumps), index=gnssir_rh.index, name=gnssir_rh.name)
 
     print('\nno jump detected!')
 
     # Q: remove outliers based on x*sigma threshold
     print('\nremove outliers based on %s * sigma threshold' % threshold)
-    upper_limit = gnssir_rh.rolling('3D').median() + threshold * gnssir_rh.rolling('3D').std()
-    lower_limit = gnssir_rh.rolling('3D').median() - threshold * gnssir_rh.rolling('3D').std()
-    gnssir_rh_clean = gnssir_rh[(gnssir_rh > lower_limit) & (gnssir_rh < upper_limit)]
+    median_3d, std_3d = rolling_median_std(gnssir_rh, '3D')
+    gnssir_rh_clean = gnssir_rh[np.abs(gnssir_rh.to_numpy() - median_3d.to_numpy()) < threshold * std_3d.to_numpy()]
 
     # resample to 15min
     gnssir_rh_clean = gnssir_rh_clean.resample('15min').median().dropna()
     gnssir_rh_clean_daily = gnssir_rh_clean.resample('D').median()
 
     # Q: convert the distance between snow surface and antenna to accumulation (by subtracting all values from first observation)
-    gnssir_acc = (gnssir_rh_clean_daily[0] - gnssir_rh_clean)
+    gnssir_acc = (gnssir_rh_clean_daily.iat[0] - gnssir_rh_clean)
     # Q: adjust the first observation value to the height of snow above antenna at the time of first observation (by adding the accumulated snow measured by laser)
     gnssir_acc = gnssir_acc + acc_at_time_of_first_obs
 
     # resample accumulation data
-    gnssir_acc_daily = gnssir_acc.resample('D').median()
-    gnssir_acc_daily_std = gnssir_acc.resample('D').std()
+    daily = gnssir_acc.resample('D')
+    gnssir_acc_daily = daily.median()
+    gnssir_acc_daily_std = daily.std()
     std_mean = gnssir_acc_daily_std.mean()
     std_percentual = gnssir_acc_daily_std * 100 / gnssir_acc_daily
     std_percentual_mean = std_percentual.mean()